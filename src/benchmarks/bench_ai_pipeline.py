@@ -0,0 +1,60 @@
+'''
+Times AIPlayer's async response path (triage -> decide_to_respond -> choose_action ->
+action -> stylizer) over a generated chat, without network access or an API key.
+"stub" answers every completion with deterministic schema-valid JSON after a fixed
+latency; "replay" serves a cassette recorded with LLM_BACKEND = "record".
+How to run:
+   python ./src/benchmarks/bench_ai_pipeline.py [stub|replay] [stub latency in seconds]
+'''
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.chatbot.ai import AIPlayer
+from utils.constants import DEBUG_PS
+
+MESSAGES = 120
+PLAYERS = ["Groot", "Ganondorf", "Yoda"]
+CHATTER = [
+    "lol", "same", "wait what", "I'd pick flying honestly", "who hasn't answered yet?",
+    "ok I think {ai} is the bot", "{ai} what do you think?", "pizza obviously",
+    "I'm voting Groot", "that's what a bot would say", "Yoda you've been quiet",
+]
+
+
+async def run(backend: str, latency: float) -> None:
+    ai = AIPlayer(PLAYERS, DEBUG_PS, backend=backend, triage=True)
+    if backend == "stub":
+        for name in ai.prompter_dict:
+            ai.prompter_dict[name].backend.latency = latency
+
+    rng = random.Random(0)
+    minutes, timings, replies = [], [], 0
+    for _ in range(MESSAGES):
+        sender = rng.choice(PLAYERS)
+        minutes.append(f"{sender}: {rng.choice(CHATTER).format(ai=ai.player_state.code_name)}")
+        start = time.perf_counter()
+        reply = await ai.adecide_to_respond(list(minutes))
+        timings.append(time.perf_counter() - start)
+        if reply != "Wait for next message":
+            replies += 1
+            minutes.append(f"{ai.player_state.code_name}: {reply}")
+
+    timings.sort()
+    ms = lambda seconds: f"{seconds * 1000:8.1f} ms"
+    print(f"backend {backend} ({len(timings)} decisions, {replies} replies)")
+    print(f"  p50 {ms(statistics.median(timings))}")
+    print(f"  p95 {ms(timings[int(len(timings) * 0.95) - 1])}")
+    print(f"  max {ms(timings[-1])}")
+    print(f"  total {sum(timings):.2f} s")
+    print(f"  usage {ai.usage_report()}")
+
+
+if __name__ == "__main__":
+    backend = sys.argv[1] if len(sys.argv) > 1 else "stub"
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    asyncio.run(run(backend, latency))
@@ -0,0 +1,98 @@
+'''
+Microbenchmark: OpenAIPrompter._build_messages before and after precompiling the
+few-shot prefix, for the DTR and CHOOSE_ACTION example sets.
+How to run:
+   python ./src/benchmarks/bench_build_messages.py
+'''
+import copy
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")  # No request is sent
+from pydantic import BaseModel
+from utils.chatbot.prompter import OpenAIPrompter
+from utils.chatbot.examples import (
+    GENERIC_PROMPT_HEADERS, DTR_EXAMPLES, DTR_MAIN_HEADER, CHOSE_ACTION_EXAMPLES,
+    CHOOSE_ACTION_MAIN_HEADER, DEFAULT_SYSTEM_PROMPT
+)
+from utils.chatbot.enums_dcs import ActionOptionBM, DecideToRespondBM
+
+CALLS = 2000
+INPUTS = {
+    "minutes": [f"Skywalker: message {i}" for i in range(40)],
+    "game_summary": '{"round_number": 1, "players_alive": ["Han Solo", "Skywalker"]}',
+}
+
+
+def legacy_format_examples(prompter):
+    """Returns a copy of the prompter's QAs formatted the way format_examples used to do in place."""
+    examples = copy.deepcopy(prompter.examples)
+    for qa in examples:
+        qa.question = {
+            key: prompter.format_q_as_string({key: value}) if isinstance(value, str) else value
+            for key, value in qa.question.items()
+        }
+        if isinstance(qa.answer, BaseModel):
+            qa.answer = qa.answer.model_dump_json()
+    return examples
+
+
+def legacy_build_messages(self, examples, input_texts):
+    """The per-call implementation that walked every example on every request."""
+    messages = [{"role": "system", "content": self.system_prompt}]
+    for qa in examples:
+        example_lines = []
+        for key, value in qa.question.items():
+            if isinstance(value, dict):
+                formatted_value = "\n".join(f"{k}: {v}" for k, v in value.items())
+            elif isinstance(value, str):
+                formatted_value = value
+            else:
+                formatted_value = str(value)
+            example_lines.append(f"{self.prompt_headers.get(key, key)}: {formatted_value}")
+        example_text = "\n".join(example_lines)
+        messages.append({"role": "user", "content": f"{self.main_prompt_header}\n{example_text}"})
+        messages.append({"role": "assistant", "content": qa.answer})
+    user_input_lines = []
+    for key, value in input_texts.items():
+        if isinstance(value, dict):
+            formatted_value = "\n".join(f"{k}: {v}" for k, v in value.items())
+        elif isinstance(value, str):
+            formatted_value = value
+        else:
+            formatted_value = str(value)
+        user_input_lines.append(f"{self.prompt_headers.get(key, key)}: {formatted_value}")
+    user_input_text = "\n".join(user_input_lines)
+    messages.append({"role": "user", "content": f"{self.main_prompt_header}\n{user_input_text}"})
+    return messages
+
+
+def main() -> None:
+    prompters = {
+        "DTR_EXAMPLES": OpenAIPrompter(
+            openai_dict_key="OPENAI_API_KEY", system_prompt=DEFAULT_SYSTEM_PROMPT,
+            examples=DTR_EXAMPLES, prompt_headers=GENERIC_PROMPT_HEADERS,
+            output_format=DecideToRespondBM, main_prompt_header=DTR_MAIN_HEADER
+        ),
+        "CHOSE_ACTION_EXAMPLES": OpenAIPrompter(
+            openai_dict_key="OPENAI_API_KEY", system_prompt=DEFAULT_SYSTEM_PROMPT,
+            examples=CHOSE_ACTION_EXAMPLES, prompt_headers=GENERIC_PROMPT_HEADERS,
+            output_format=ActionOptionBM, main_prompt_header=CHOOSE_ACTION_MAIN_HEADER
+        ),
+    }
+    print(f"{'example set':<22} | {'examples':>8} | {'before (us)':>11} | {'after (us)':>10} | {'speedup':>7}")
+    print("-" * 72)
+    for name, prompter in prompters.items():
+        examples = legacy_format_examples(prompter)
+        assert legacy_build_messages(prompter, examples, INPUTS) == prompter._build_messages(INPUTS)
+        before = timeit.timeit(
+            lambda: legacy_build_messages(prompter, examples, INPUTS), number=CALLS)
+        after = timeit.timeit(lambda: prompter._build_messages(INPUTS), number=CALLS)
+        print(f"{name:<22} | {len(prompter.examples):>8} | {before / CALLS * 1e6:>11.1f} | "
+              f"{after / CALLS * 1e6:>10.1f} | {before / after:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
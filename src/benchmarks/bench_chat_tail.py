@@ -0,0 +1,61 @@
+'''
+Benchmark: cost of one chat poll as the lobby chat log grows.
+How to run:
+   python ./src/benchmarks/bench_chat_tail.py
+'''
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.file_io import ChatTailReader, append_message, read_new_messages
+
+CHECKPOINTS = [1_000, 10_000, 25_000, 50_000, 100_000]
+POLLS = 50
+
+
+def time_polls(poll, path: str) -> float:
+    """Appends one message before each poll and returns the mean poll time in microseconds."""
+    total = 0.0
+    for i in range(POLLS):
+        append_message(path, f"Skywalker: poll message {i}")
+        start = time.perf_counter()
+        poll()
+        total += time.perf_counter() - start
+    return total / POLLS * 1e6
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "chat_log.txt")
+        open(path, "w").close()
+
+        reader = ChatTailReader(path)
+        last_line = 0
+
+        def readlines_poll():
+            nonlocal last_line
+            _, last_line = read_new_messages(path, last_line)
+
+        print(f"{'lines':>10} | {'readlines (us)':>15} | {'tail reader (us)':>17}")
+        print("-" * 48)
+        written = 0
+        for target in CHECKPOINTS:
+            with open(path, "a", encoding="utf-8") as f:
+                for i in range(written, target):
+                    f.write(f"Han Solo: filler message number {i} to grow the log\n")
+            written = target
+
+            # Catch both readers up before timing steady-state polls
+            readlines_poll()
+            reader.read_new()
+
+            old = time_polls(readlines_poll, path)
+            new = time_polls(reader.read_new, path)
+            written += 2 * POLLS
+            print(f"{target:>10,} | {old:>15.1f} | {new:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
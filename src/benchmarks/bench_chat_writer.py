@@ -0,0 +1,101 @@
+'''
+Stress benchmark: many processes and threads appending to one chat log at once.
+Reports messages/sec and checks that no line was torn or interleaved.
+How to run:
+   python ./src/benchmarks/bench_chat_writer.py [directory]
+(pass a directory on a real disk; fsync is nearly free on tmpfs)
+'''
+import hashlib
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.file_io import ChatWriter
+
+PROCESSES = 4
+THREADS_PER_PROCESS = 4
+MESSAGES_PER_THREAD = 250
+BENCH_DIR = sys.argv[1] if len(sys.argv) > 1 else None
+
+
+def make_message(proc: int, thread: int, i: int) -> str:
+    # Vary the length so torn writes would be visible
+    body = "lol " * (1 + (i * 7 + thread) % 60)
+    digest = hashlib.md5(body.encode()).hexdigest()[:8]
+    return f"P{proc}T{thread}: {i} {digest} {body.strip()}"
+
+
+def worker(path: str, proc: int, group_window: float, naive: bool) -> None:
+    writer = ChatWriter(path, group_window=group_window)
+
+    def run(thread: int) -> None:
+        for i in range(MESSAGES_PER_THREAD):
+            msg = make_message(proc, thread, i)
+            if naive:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(msg + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            else:
+                writer.append(msg)
+
+    threads = [threading.Thread(target=run, args=(t,)) for t in range(THREADS_PER_PROCESS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def verify(path: str) -> tuple:
+    """Returns (lines, corrupted_lines, missing_messages)."""
+    seen = set()
+    corrupted = 0
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().split("\n")[:-1]
+    for line in lines:
+        try:
+            sender, rest = line.split(": ", 1)
+            i, digest, body = rest.split(" ", 2)
+            if hashlib.md5((body + " ").encode()).hexdigest()[:8] != digest:
+                raise ValueError
+            seen.add((sender, int(i)))
+        except ValueError:
+            corrupted += 1
+    expected = PROCESSES * THREADS_PER_PROCESS * MESSAGES_PER_THREAD
+    return len(lines), corrupted, expected - len(seen)
+
+
+def run_case(label: str, group_window: float, naive: bool = False) -> None:
+    with tempfile.TemporaryDirectory(dir=BENCH_DIR) as tmp:
+        path = os.path.join(tmp, "chat_log.txt")
+        open(path, "w").close()
+        procs = [
+            mp.Process(target=worker, args=(path, p, group_window, naive))
+            for p in range(PROCESSES)
+        ]
+        start = time.perf_counter()
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+        lines, corrupted, missing = verify(path)
+        total = PROCESSES * THREADS_PER_PROCESS * MESSAGES_PER_THREAD
+        print(f"{label:<28} | {total / elapsed:>10,.0f} | {lines:>6} | {corrupted:>9} | {missing:>7}")
+
+
+def main() -> None:
+    print(f"{PROCESSES} processes x {THREADS_PER_PROCESS} threads x {MESSAGES_PER_THREAD} messages")
+    print(f"{'writer':<28} | {'msgs/sec':>10} | {'lines':>6} | {'corrupted':>9} | {'missing':>7}")
+    print("-" * 72)
+    run_case("open/append/fsync, no lock", 0, naive=True)
+    run_case("ChatWriter", 0)
+    run_case("ChatWriter, 1 ms window", 0.001)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+'''
+Drives AIPlayer's async decision chain against the local mock completion server, so every
+request goes through the real openai/httpx stack with a chosen latency distribution, error
+rate and 429 rate. Prints per-decision latency percentiles and what the server saw.
+The shared rate limiter gets an unlimited budget, so the numbers are the completion path's
+own; its queueing is reported separately.
+How to run:
+   python ./src/benchmarks/bench_mock_latency.py [p50 p95 p99 error_rate rate_limit_rate] [--hedge] [--rate-limit]
+(--hedge turns on hedged requests for every prompter; --rate-limit keeps the RATE_LIMIT_RPM
+and RATE_LIMIT_TPM budget)
+To play the game against the mock server instead, start it on a fixed port with
+   python ./src/benchmarks/bench_mock_latency.py serve 8765
+and set OPENAI_BASE_URL=http://127.0.0.1:8765/v1 in resources/.env.
+'''
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")  # The mock server ignores it
+from utils.chatbot.mock_server import MockCompletionServer, MockProfile
+
+DECISIONS = 60
+UNLIMITED_RPM, UNLIMITED_TPM = 10 ** 9, 10 ** 12
+ACTION_NAMES = [
+    "decide_to_respond", "choose_action", "introduce", "defend", "accuse", "joke",
+    "question", "other", "stylizer"
+]
+PLAYERS = ["Groot", "Ganondorf", "Yoda"]
+CHATTER = [
+    "lol", "same", "who hasn't answered yet?", "ok I think {ai} is the bot",
+    "{ai} what do you think?", "I'm voting Groot", "that's what a bot would say",
+]
+
+
+async def run(profile: MockProfile, hedge: bool, rate_limit: bool) -> None:
+    server = await MockCompletionServer(profile).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url  # Read by the shared openai clients
+    from utils.chatbot.ai import AIPlayer
+    from utils.chatbot.clients import ClientRegistry
+    from utils.chatbot.rate_limiter import get_rate_limiter
+    from utils.constants import DEBUG_PS
+
+    limiter = get_rate_limiter()
+    if not rate_limit:
+        limiter.rpm, limiter.tpm = UNLIMITED_RPM, UNLIMITED_TPM
+
+    ai = AIPlayer(PLAYERS, DEBUG_PS, hedge_prompters=ACTION_NAMES if hedge else ())
+    code_name = ai.player_state.code_name
+    rng = random.Random(0)
+    minutes, timings = [], []
+    for _ in range(DECISIONS):
+        minutes.append(f"{rng.choice(PLAYERS)}: {rng.choice(CHATTER).format(ai=code_name)}")
+        start = time.perf_counter()
+        reply = await ai.adecide_to_respond(list(minutes))
+        timings.append(time.perf_counter() - start)
+        if reply != "Wait for next message":
+            minutes.append(f"{code_name}: {reply}")
+    await server.close()
+
+    timings.sort()
+    ms = lambda seconds: f"{seconds * 1000:8.1f} ms"
+    print(f"profile {profile}, hedge {hedge}, rate limit {rate_limit}")
+    print(f"  decisions {len(timings)}, p50 {ms(statistics.median(timings))}, "
+          f"p95 {ms(timings[int(len(timings) * 0.95) - 1])}, max {ms(timings[-1])}")
+    print(f"  server {server.stats}")
+    print(f"  pool {ClientRegistry.get_instance().pool_stats()}")
+    print(f"  rate limiter {limiter.report()}")
+    for name, report in ai.latency_report().items():
+        print(f"  {name:<20} {report}")
+
+
+async def serve(port: int) -> None:
+    server = await MockCompletionServer(MockProfile(), port=port).start()
+    print(f"Mock completion server on {server.base_url}")
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        asyncio.run(serve(int(sys.argv[2]) if len(sys.argv) > 2 else 8765))
+    else:
+        hedge = "--hedge" in sys.argv
+        rate_limit = "--rate-limit" in sys.argv
+        values = [float(arg) for arg in sys.argv[1:] if not arg.startswith("--")][:5]
+        names = ["p50", "p95", "p99", "error_rate", "rate_limit_rate"]
+        defaults = {"p50": 0.05, "p95": 0.2, "p99": 0.5, "seed": 0}
+        asyncio.run(run(MockProfile(**{**defaults, **dict(zip(names, values))}), hedge, rate_limit))
@@ -0,0 +1,75 @@
+'''
+Token savings from normalizing chat lines (ANSI escapes stripped, Game Master banners
+collapsed to one GM: line) before they are sent to the AI as minutes, plus the cost of
+normalizing per line.
+How to run:
+   python ./src/benchmarks/bench_normalize_minutes.py [chat_log.txt ...]
+(with no arguments a three-round transcript in the game's own format is generated)
+'''
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from utils.asthetics import format_gm_message
+from utils.chat_normalize import MinutesNormalizer
+from utils.chatbot.prompter import estimate_text_tokens
+
+ROUNDS = 3
+MESSAGES_PER_ROUND = 40
+PLAYERS = ["Groot", "Ganondorf", "Yoda", "Anger"]
+ICEBREAKERS = [
+    "Round 1 icebreaker: If you could have any superpower, what would it be and why?",
+    "Round 2 icebreaker: What's the best snack at the school cafeteria?",
+    "Round 3 icebreaker: What would you do with a free day and no homework?",
+]
+CHATTER = [
+    "lol", "same", "wait what", "I'd pick flying honestly", "nah that's sus",
+    "who hasn't answered yet?", "Yoda you've been quiet", "ok I think Anger is the bot",
+    "pizza obviously", "I'm voting Groot", "bruh", "that's what a bot would say",
+]
+
+
+def generated_transcript() -> list:
+    rng = random.Random(0)
+    lines = format_gm_message("Welcome to Dopplebot! Everyone, please introduce yourselves.").split("\n")
+    for round_number in range(ROUNDS):
+        lines += format_gm_message(ICEBREAKERS[round_number]).split("\n")
+        for _ in range(MESSAGES_PER_ROUND):
+            lines.append(f"{rng.choice(PLAYERS)}: {rng.choice(CHATTER)}")
+        lines += format_gm_message(f"Round {round_number + 1} is over. Time to vote!").split("\n")
+    return lines
+
+
+def measure(name: str, lines: list) -> None:
+    normalizer = MinutesNormalizer()
+    minutes = [m for m in (normalizer.normalize(line) for line in lines) if m is not None]
+    minutes = [minute for minute, _ in minutes]
+
+    # Minutes go into prompts as one string, the way the prompters format lists
+    raw_tokens = estimate_text_tokens(str(lines))
+    new_tokens = estimate_text_tokens(str(minutes))
+
+    repeats = max(1, 200_000 // max(1, len(lines)))
+    start = time.perf_counter()
+    for _ in range(repeats):
+        normalizer = MinutesNormalizer()
+        for line in lines:
+            normalizer.normalize(line)
+    per_line_us = (time.perf_counter() - start) / (repeats * len(lines)) * 1e6
+
+    print(f"{name}")
+    print(f"  lines:  {len(lines):>6} raw -> {len(minutes):>6} minutes")
+    print(f"  tokens: {raw_tokens:>6} raw -> {new_tokens:>6} minutes "
+          f"({1 - new_tokens / raw_tokens:.0%} fewer, estimated)")
+    print(f"  normalize: {per_line_us:.2f} us/line")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, "r", encoding="utf-8") as f:
+                measure(path, [line.strip() for line in f])
+    else:
+        measure(f"generated transcript ({ROUNDS} rounds)", generated_transcript())
@@ -0,0 +1,81 @@
+'''
+Startup benchmark: how often pydantic's model_json_schema runs while compiling the
+few-shot example packs, with the per-model schema cache and without it, plus the size
+of the schema text embedded in prompts.
+How to run:
+   python ./src/benchmarks/bench_schema_cache.py
+'''
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from pydantic import BaseModel
+
+AIS = 3  # Packs used to be re-formatted once per AIPlayer
+
+calls = 0
+_original = BaseModel.model_json_schema.__func__
+
+
+def counting_model_json_schema(cls, *args, **kwargs):
+    global calls
+    calls += 1
+    return _original(cls, *args, **kwargs)
+
+
+BaseModel.model_json_schema = classmethod(counting_model_json_schema)
+
+from utils.chatbot import prompter  # noqa: E402
+
+
+def compile_all_packs() -> None:
+    """Re-imports example_packs from scratch so every pack is compiled again."""
+    sys.modules.pop("utils.chatbot.example_packs", None)
+    prompter._example_packs.clear()
+    import utils.chatbot.example_packs  # noqa: F401
+
+
+def measure(label: str, rounds: int) -> None:
+    global calls
+    calls = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        compile_all_packs()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{label:<34} | {calls:>17} | {elapsed:>9.1f}")
+
+
+def main() -> None:
+    print(f"{'startup for ' + str(AIS) + ' AIs':<34} | {'model_json_schema':>17} | {'ms':>9}")
+    print("-" * 66)
+
+    cached_model_schema, cached_compact = prompter.model_schema, prompter.compact_schema
+    prompter.model_schema = lambda output_format: output_format.model_json_schema()
+    prompter.compact_schema = lambda output_format: str(output_format.model_json_schema())
+    measure("no cache, packs rebuilt per AI", AIS)
+
+    prompter.model_schema, prompter.compact_schema = cached_model_schema, cached_compact
+    measure("schema cache + shared packs", 1)
+
+    print()
+    print(f"{'model':<20} | {'repr chars':>10} | {'minified chars':>14}")
+    print("-" * 50)
+    for output_format in _models():
+        print(f"{output_format.__name__:<20} | {len(str(output_format.model_json_schema())):>10} | "
+              f"{len(prompter.compact_schema(output_format)):>14}")
+
+
+def _models():
+    from utils.chatbot import example_packs
+    seen = []
+    for name in dir(example_packs):
+        if name.endswith("_PACK"):
+            output_format = getattr(example_packs, name).output_format
+            if output_format not in seen:
+                seen.append(output_format)
+    return seen
+
+
+if __name__ == "__main__":
+    main()
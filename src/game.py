@@ -1,19 +1,20 @@
-import os
 import asyncio
+import time
+from typing import List
 from prompt_toolkit.shortcuts import PromptSession, print_formatted_text
 from prompt_toolkit.formatted_text import ANSI
 
 from utils.asthetics import (
     format_gm_message, get_color_for_code_name, print_color, clear_screen)
 from utils.logging_utils import MasterLogger, StandAloneLogger
+from utils.lobby_watch import debounce, watch_file
+from utils.chat_cache import LobbyChatCache
+from utils.lobby_store import get_lobby_store
 from utils.states import GameState, ScreenState, PlayerState
-from utils.constants import DEBUG_PS
+from utils.constants import AI_MAX_WAIT, AI_QUIET_PERIOD, DEBUG_PS
 from utils.chatbot.ai import AIPlayer
-
-from utils.file_io import (
-    append_message, read_new_messages, init_chat_log, 
-    save_player_to_lobby_file, load_players_from_lobby
-)
+from utils.chatbot.clients import ClientRegistry
+from utils.chatbot.rate_limiter import get_rate_limiter
 
 async def refresh_messages_loop(
     chat_log_path: str, gs: GameState, ps: 
@@ -25,16 +26,26 @@ async def refresh_messages_loop(
         chat_log_path (str): Path to the chat log file.
         gs (GameState): Current game state object.
         ps (PlayerState): Player state object.
-        delay (float): Delay between refreshes.
+        delay (float): Polling interval used when file notifications are unavailable.
     """
-    last_line = 0  # Tracks the last read line number
-    while True:
-        await asyncio.sleep(delay)  # Pause to prevent busy looping
-        new_msgs, last_line = read_new_messages(chat_log_path, last_line)
+    store = get_lobby_store()
+    cache = LobbyChatCache.get_instance(chat_log_path, store.chat_reader(ps.lobby_id))
+    seen = 0  # Tracks the number of cached messages already printed
+    round_number = gs.round_number
+    async for _ in watch_file(store.change_path(ps.lobby_id), poll_interval=delay):
+        if gs.round_number != round_number:
+            # Messages read from here on belong to the new round
+            round_number = gs.round_number
+            cache.start_round()
+        await asyncio.to_thread(cache.refresh)
+        new_msgs, seen = cache.since(seen)
+        gs.all_chat = cache.lines
+        gs.chat_this_round = cache.round_lines
 
         # If there are new messages, update the game state and print them
         if new_msgs:
-            gs.players = load_players_from_lobby(ps.lobby_id)
+            gs.players = await asyncio.to_thread(store.load_players, ps.lobby_id)
+            gs.players_by_code_name = await asyncio.to_thread(store.load_players_by_code_name, ps.lobby_id)
             formatted_msgs = []
 
             for msg in new_msgs:
@@ -51,49 +62,107 @@ async def refresh_messages_loop(
             print_formatted_text(ANSI("\n".join(formatted_msgs)))
 
 async def ai_loop(
-    chat_log_path: str, ps: PlayerState, master_logger: 
-    MasterLogger, sa_logger: StandAloneLogger, delay: float = 0.25) -> None:
+    chat_log_path: str, gs: GameState, ps: PlayerState, master_logger: 
+    MasterLogger, sa_logger: StandAloneLogger, delay: float = 0.25,
+    quiet_period: float = AI_QUIET_PERIOD, max_wait: float = AI_MAX_WAIT) -> None:
     """
     Manages the AI response loop, ensuring the AI does not respond to its own message repeatedly.
+    Messages arriving in a burst are coalesced so the AI makes one decision over all of them,
+    and a relevant message arriving mid-reply cancels the stale reply and starts a fresh one.
+    The AI sees the cache's normalized minutes (no ANSI codes, one `GM:` line per banner).
 
     Args:
         chat_log_path (str): Path to the chat log file.
+        gs (GameState): Current game state object; replies are stored under its round.
         ps (PlayerState): Player state object (including AI data).
         master_logger (MasterLogger): Central logging instance.
         sa_logger (StandAloneLogger): Player-specific logging instance.
-        delay (float): Delay between AI response checks.
+        delay (float): Polling interval used when file notifications are unavailable.
+        quiet_period (float): Seconds without a new message before the AI reacts to a burst.
+        max_wait (float): Longest the AI waits for a burst to end.
     """
-    last_message_count = 0  # Tracks the number of messages seen by the AI
-    ai_code_name = ps.ai_doppleganger.player_state.code_name
-
-    while True:
-        new_messages, new_message_count = read_new_messages(chat_log_path, last_message_count)
-
-        if new_messages:
-            full_log, _ = read_new_messages(chat_log_path, 0)
-
-            # Prevent AI from responding to its own latest message
-            last_line = full_log[-1] if full_log else ""
-            if last_line.startswith(f"{ai_code_name}:"):
-                await asyncio.sleep(delay)
-                last_message_count = new_message_count
-                continue
-
-            # Generate a response from the AI if the message is not self-generated
-            ai_response = ps.ai_doppleganger.decide_to_respond(full_log)
+    store = get_lobby_store()
+    cache = LobbyChatCache.get_instance(chat_log_path, store.chat_reader(ps.lobby_id))
+    seen = 0  # Tracks the number of messages seen by the AI
+    ai = ps.ai_doppleganger
+    ai_code_name = ai.player_state.code_name
+    changes = watch_file(store.change_path(ps.lobby_id), poll_interval=delay)
+    generation = None  # The reply being generated, if any
+    posting = False    # True once the reply is being written; it is no longer cancelled then
+    deferred = False   # Messages arrived during the reply that it did not account for
+
+    async def respond(full_log: List[str]) -> None:
+        nonlocal posting, deferred
+        while True:
+            started = time.perf_counter()
+            ai_response = await ai.adecide_to_respond(full_log)
+            sa_logger.info(
+                f"[AI] {ai_code_name} ({ai.response_mode}) reply latency: "
+                f"{time.perf_counter() - started:.2f}s")
 
             if ai_response and not ai_response.startswith("Wait for"):
                 ai_msg = f"{ai_code_name}: {ai_response}"
-                append_message(chat_log_path, ai_msg)
+                posting = True
+                try:
+                    # Off the event loop, so concurrent appends can share one group commit
+                    await asyncio.to_thread(
+                        get_lobby_store().append_message, ps.lobby_id, ai_msg, gs.round_number)
+                finally:
+                    posting = False
                 master_logger.log(f"[AI] {ai_code_name} responded: {ai_response}")
                 sa_logger.info(f"[AI] {ai_code_name} responded: {ai_response}")
+                master_logger.log(f"[AI] HTTP pool: {ClientRegistry.get_instance().pool_stats()}")
+                master_logger.log(f"[AI] Rate limiter: {get_rate_limiter().report()}")
+                sa_logger.info(f"[AI] {ai_code_name} token usage: {ai.usage_report()}")
+                sa_logger.info(f"[AI] {ai_code_name} completion latency: {ai.latency_report()}")
 
-            last_message_count = new_message_count
+            if not deferred:
+                return
+            # Decide again now that the reply is out, so the messages held back get an answer too
+            deferred = False
+            full_log = cache.minutes_until(seen)
 
-        await asyncio.sleep(delay)
+    def log_failure(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            sa_logger.error(f"[AI] {ai_code_name} reply failed: {task.exception()!r}")
+
+    try:
+        async for _ in debounce(changes, quiet_period, max_wait):
+            await asyncio.to_thread(cache.refresh)
+            new_lines, now = cache.since(seen)
+            new_messages, senders = cache.minutes_between(seen, now)
+            seen = now
+
+            if new_lines:
+                # Prevent AI from responding when the only new message is its own
+                if all(sender == ai_code_name for sender in senders):
+                    continue
+                if len(new_messages) > 1:
+                    sa_logger.info(f"[AI] {ai_code_name} coalesced {len(new_messages)} new messages")
+
+                if generation is not None and not generation.done():
+                    if posting:
+                        await asyncio.wait({generation})  # Failures are logged by log_failure
+                    elif ai.is_relevant(new_messages):
+                        saved = await ai.apreempt(generation)
+                        sa_logger.info(
+                            f"[AI] {ai_code_name} preempted a stale reply (~{saved} tokens saved, "
+                            f"{ai.preemption_stats})")
+                    else:
+                        # Nothing the reply in flight needs to change for; decide on them once it is out
+                        deferred = True
+                        continue
+                deferred = False
+
+                # Generate a response from the AI over everything seen so far
+                generation = asyncio.create_task(respond(cache.minutes_until(seen)))
+                generation.add_done_callback(log_failure)
+    finally:
+        if generation is not None:
+            generation.cancel()
 
 async def user_input_loop(
-        session: PromptSession, chat_log_path: str, ps: PlayerState, 
+        session: PromptSession, chat_log_path: str, gs: GameState, ps: PlayerState, 
         master_logger: MasterLogger, sa_logger: StandAloneLogger) -> None:
     """
     Continuously prompts the user for input and logs the messages.
@@ -101,6 +170,7 @@ async def user_input_loop(
     Args:
         session (PromptSession): The interactive session for user input.
         chat_log_path (str): Path to the chat log file.
+        gs (GameState): Current game state object; messages are stored under its round.
         ps (PlayerState): Player state object.
         master_logger (MasterLogger): Central logging instance.
         sa_logger (StandAloneLogger): Player-specific logging instance.
@@ -113,7 +183,8 @@ async def user_input_loop(
             raise asyncio.CancelledError
 
         player_msg = f"{ps.code_name}: {user_input}"
-        append_message(chat_log_path, player_msg)
+        await asyncio.to_thread(
+            get_lobby_store().append_message, ps.lobby_id, player_msg, gs.round_number)
         master_logger.log(f"[User] {ps.code_name} sent: {user_input}")
         sa_logger.info(f"[User] {ps.code_name} sent: {user_input}")
 
@@ -148,20 +219,22 @@ async def play_game(
         init=init_logger
     )
 
+    store = get_lobby_store()
+
     # Save player state if new
     if not ps.written_to_file:
         clear_screen()
         ps.written_to_file = True
-        save_player_to_lobby_file(ps)
+        store.save_player(ps)
         master_logger.log(f"Player {ps.code_name} saved to lobby file.")
 
     # Initialize chat log and game setup
     chat_log_path = f"./data/runtime/lobbies/lobby_{ps.lobby_id}/chat_log.txt"
-    if not os.path.exists(chat_log_path):
-        init_chat_log(chat_log_path)
-        append_message(
-            chat_log_path, 
-            format_gm_message("Welcome to Dopplebot! Everyone, please introduce yourselves."))
+    if store.init_lobby(ps.lobby_id):
+        store.append_message(
+            ps.lobby_id,
+            format_gm_message("Welcome to Dopplebot! Everyone, please introduce yourselves."),
+            gs.round_number)
         master_logger.log("Initialized chat log and added intro message.")
 
     # Start background message refresher
@@ -169,8 +242,8 @@ async def play_game(
 
     try:
         await asyncio.gather(
-            ai_loop(chat_log_path, ps, master_logger, sa_logger),
-            user_input_loop(session, chat_log_path, ps, master_logger, sa_logger)
+            ai_loop(chat_log_path, gs, ps, master_logger, sa_logger),
+            user_input_loop(session, chat_log_path, gs, ps, master_logger, sa_logger)
         )
     except asyncio.CancelledError:
         pass
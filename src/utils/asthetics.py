@@ -4,12 +4,6 @@ from prompt_toolkit.shortcuts import print_formatted_text
 from utils.constants import COLOR_DICT
 from utils.states import GameState
 
-def get_color_for_code_name(code_name: str, gs: GameState) -> str:
-    for player in gs.players:
-        if player.code_name == code_name:
-            return player.color_name
-    raise ValueError(f"Unknown code_name in chat: '{code_name}'")
-
 def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
@@ -39,7 +33,12 @@ def format_gm_message(msg: str) -> str:
     return f"{top}\n{mid}\n{bot}"
 
 def get_color_for_code_name(code_name: str, gs: GameState) -> str:
-    for player in gs.players:
-        if player.code_name == code_name:
-            return player.color_name
+    player = gs.players_by_code_name.get(code_name)
+    if player is not None:
+        return player.color_name
+    if not gs.players_by_code_name:
+        # Roster index not populated yet, fall back to a scan
+        for player in gs.players:
+            if player.code_name == code_name:
+                return player.color_name
     return "WHITE"
\ No newline at end of file
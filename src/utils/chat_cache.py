@@ -0,0 +1,106 @@
+import threading
+from typing import Dict, List, Tuple
+
+from utils.chat_normalize import MinutesNormalizer
+from utils.file_io import ChatTailReader
+
+
+class LobbyChatCache:
+    """
+    In-memory copy of a lobby's chat log, shared by every loop in the process.
+
+    The log is read incrementally through a single reader (a ChatTailReader, or the
+    lobby store's chat reader), so each appended line is read and parsed exactly once
+    per process no matter how many loops consume it. Consumers keep their own cursor
+    into `lines` and fetch what they have not seen with `since`.
+
+    Alongside the raw lines the cache keeps `minutes`, the normalized lines for the AI
+    (see MinutesNormalizer), with the sender of each in `senders`. Both are built once
+    per line as it arrives and are addressed with the same cursors as `lines`.
+    """
+    _instances: Dict[str, "LobbyChatCache"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, chat_log_path: str, reader=None):
+        self.chat_log_path = chat_log_path
+        self.lines: List[str] = []          # Every message in the game so far
+        self.round_lines: List[str] = []    # Messages since the current round started
+        self.minutes: List[str] = []        # Normalized lines for the AI prompters
+        self.senders: List[str] = []        # Interned code name behind each minute
+        self._minute_counts: List[int] = [] # len(minutes) after each raw line
+        self._normalizer = MinutesNormalizer()
+        self._reader = reader if reader is not None else ChatTailReader(chat_log_path)
+        self._refresh_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls, chat_log_path: str, reader=None) -> "LobbyChatCache":
+        """
+        Returns the process-wide cache for a chat log, creating it on first use.
+
+        Args:
+            chat_log_path (str): Path identifying the lobby's chat.
+            reader: Incremental reader used if the cache is created by this call.
+                Defaults to a ChatTailReader over `chat_log_path`.
+        """
+        with cls._lock:
+            if chat_log_path not in cls._instances:
+                cls._instances[chat_log_path] = cls(chat_log_path, reader)
+            return cls._instances[chat_log_path]
+
+    def refresh(self) -> int:
+        """
+        Appends any lines written to the log since the last refresh.
+
+        Returns:
+            int: Number of new lines.
+        """
+        with self._refresh_lock:
+            before = self._reader.line_count
+            new_lines = self._reader.read_new()
+            if self._reader.line_count < before + len(new_lines):
+                # The reader started over because the log was truncated
+                self.lines = []
+                self.round_lines = []
+                self.minutes, self.senders, self._minute_counts = [], [], []
+            self.lines.extend(new_lines)
+            self.round_lines.extend(new_lines)
+            for line in new_lines:
+                normalized = self._normalizer.normalize(line)
+                if normalized is not None:
+                    self.minutes.append(normalized[0])
+                    self.senders.append(normalized[1])
+                self._minute_counts.append(len(self.minutes))
+            return len(new_lines)
+
+    def since(self, cursor: int) -> Tuple[List[str], int]:
+        """
+        Returns the lines after `cursor` and the cursor to pass next time.
+
+        Args:
+            cursor (int): Number of lines the caller has already seen.
+        """
+        if cursor > len(self.lines):
+            cursor = 0  # The log was reset underneath this consumer
+        return self.lines[cursor:], len(self.lines)
+
+    def _minute_index(self, cursor: int) -> int:
+        """Converts a cursor into `lines` to the matching position in `minutes`."""
+        if cursor <= 0:
+            return 0
+        return self._minute_counts[min(cursor, len(self._minute_counts)) - 1]
+
+    def minutes_until(self, cursor: int) -> List[str]:
+        """Returns the normalized minutes for the first `cursor` lines."""
+        return self.minutes[:self._minute_index(cursor)]
+
+    def minutes_between(self, start: int, end: int) -> Tuple[List[str], List[str]]:
+        """Returns the normalized minutes and their senders for lines start..end."""
+        if start > end:
+            start = 0  # The log was reset underneath this consumer
+        first, last = self._minute_index(start), self._minute_index(end)
+        return self.minutes[first:last], self.senders[first:last]
+
+    def start_round(self) -> None:
+        """Begins a new round; `round_lines` only collects messages from here on."""
+        with self._refresh_lock:
+            self.round_lines = []
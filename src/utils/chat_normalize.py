@@ -0,0 +1,63 @@
+import re
+import sys
+from typing import Dict, Optional, Tuple
+
+# CSI escape sequences, e.g. the color codes print_color and format_gm_message write
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
+# The asterisk bars format_gm_message puts above and below a Game Master message
+BANNER_BAR = re.compile(r"\*{3,}")
+GM_PREFIX = re.compile(r"(?:GAME ?MASTER|GM)\s*:\s*", re.IGNORECASE)
+GM_SENDER = "GM"
+
+
+def is_gm_banner(message: str) -> bool:
+    """
+    Whether a stored chat message is exactly a format_gm_message banner: an asterisk bar, one
+    `GAME MASTER: ...` line and another bar. A player's message that merely mentions the
+    Game Master or contains asterisks is not.
+    """
+    if "\x1b" in message:
+        message = ANSI_ESCAPE.sub("", message)
+    lines = message.strip().split("\n")
+    return (
+        len(lines) == 3
+        and all(BANNER_BAR.fullmatch(bar.strip()) for bar in (lines[0], lines[2]))
+        and GM_PREFIX.match(lines[1].strip()) is not None
+    )
+
+
+class MinutesNormalizer:
+    """
+    Turns raw chat_log.txt lines into the minutes the AI prompters see.
+
+    Strips ANSI escapes, drops the asterisk bars around Game Master messages so each banner
+    becomes one `GM: ...` line, and interns sender code names so every minute from the same
+    player shares one name object.
+    """
+    def __init__(self):
+        self._senders: Dict[str, str] = {GM_SENDER: sys.intern(GM_SENDER)}
+
+    def sender(self, name: str) -> str:
+        """Returns the interned copy of a code name."""
+        interned = self._senders.get(name)
+        if interned is None:
+            interned = self._senders[name] = sys.intern(name)
+        return interned
+
+    def normalize(self, line: str) -> Optional[Tuple[str, str]]:
+        """
+        Returns (minute, sender) for one raw chat line, or None if the line carries no
+        content (blank lines, banner bars).
+        """
+        if "\x1b" in line:
+            line = ANSI_ESCAPE.sub("", line)
+        line = line.strip()
+        if not line or BANNER_BAR.fullmatch(line):
+            return None
+
+        gm = GM_PREFIX.match(line)
+        if gm:
+            return f"{GM_SENDER}: {line[gm.end():]}", self._senders[GM_SENDER]
+
+        name, sep, _ = line.partition(":")
+        return line, self.sender(name) if sep else ""
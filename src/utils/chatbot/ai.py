@@ -1,26 +1,37 @@
+import asyncio
 from dataclasses import asdict
 import json
-from typing import List, Tuple, Union
-from functools import wraps
+from typing import Dict, Iterable, List, Tuple, Union
+from functools import partial, wraps
 import inspect
-from .prompter import OpenAIPrompter
+from .prompter import AsyncOpenAIPrompter, LazyPrompterRegistry, check_backend_config, estimate_text_tokens
+from .minutes_window import MinutesWindow
+from .triage import ResponseTriage, Verdict
 from utils.logging_utils import StandAloneLogger
 from .examples import (
-    GENERIC_PROMPT_HEADERS, CHOOSE_ACTION_MAIN_HEADER, CHOSE_ACTION_EXAMPLES, 
-    DEFEND_MAIN_HEADER, DEFEND_EXAMPLES, ACCUSE_MAIN_HEADER, ACCUSE_EXAMPLES, 
-    DTR_EXAMPLES, DTR_MAIN_HEADER,GSU_HEADERS, INTRO_EXAMPLES, INTRO_MAIN_HEADER, JOKE_MAIN_HEADER,
-    JOKE_EXAMPLES, OTHER_EXAMPLES, OTHER_MAIN_HEADER, QUESTION_MAIN_HEADER, QUESTION_EXAMPLES, SIMPLE_PHRASE_MAIN_HEADER, 
-    SIMPLE_PHRASE_EXAMPLES, GSU_MAIN_HEADER, GSU_EXAMPLES, STYLIZER_EXAMPLES, STYLIZER_HEADERS, 
-    STYLIZER_MAIN_HEADER, DEFAULT_SYSTEM_PROMPT
+    GENERIC_PROMPT_HEADERS, CHOOSE_ACTION_MAIN_HEADER, DEFEND_MAIN_HEADER, ACCUSE_MAIN_HEADER, 
+    DTR_MAIN_HEADER,GSU_HEADERS, INTRO_MAIN_HEADER, JOKE_MAIN_HEADER, OTHER_MAIN_HEADER, 
+    QUESTION_MAIN_HEADER, SIMPLE_PHRASE_MAIN_HEADER, GSU_MAIN_HEADER, STYLIZER_HEADERS, 
+    STYLIZER_MAIN_HEADER, DEFAULT_SYSTEM_PROMPT, FUSED_HEADERS, FUSED_MAIN_HEADER,
+    ROLLING_SUMMARY_HEADERS, ROLLING_SUMMARY_MAIN_HEADER
+)
+from .example_packs import (
+    DTR_PACK, CHOOSE_ACTION_PACK, INTRO_PACK, STYLIZER_PACK, DEFEND_PACK, ACCUSE_PACK, 
+    JOKE_PACK, QUESTION_PACK, SIMPLE_PHRASE_PACK, OTHER_PACK, GSU_PACK, FUSED_PACK,
+    ROLLING_SUMMARY_PACK
 )
 from .enums_dcs import (
     IntroBM, JokeBM, QuestionBM, SimplePhraseBM, StylizerBM, Team, ActionOptionBM, DecideToRespondBM, 
-    DefendYourselfBM, AccusePlayerBM, GameSummaryBM
+    DefendYourselfBM, AccusePlayerBM, GameSummaryBM, FusedResponseBM
 )
 import sys
 sys.path.append("../../")
 from utils.states import ScreenState, PlayerState, GameState
-from utils.constants import COLOR_DICT, NAMES_PATH, NAMES_INDEX_PATH, COLORS_PATH, COLORS_INDEX_PATH
+from utils.constants import (
+    COLOR_DICT, NAMES_PATH, NAMES_INDEX_PATH, COLORS_PATH, COLORS_INDEX_PATH, MINUTES_KEEP_LAST,
+    MINUTES_TOKEN_BUDGET, MINUTES_FOLD_BATCH, LLM_BACKEND, COMPLETION_DEADLINE, COMPLETION_DEADLINES,
+    RATE_LIMIT_PRIORITIES
+)
 from utils.file_io import SequentialAssigner
 
 # TODO -> use the sequential assigner to assign a code name and color to the AI player
@@ -29,6 +40,32 @@ from utils.file_io import SequentialAssigner
 
 def handle_errors():
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                try:
+                    return await func(self, *args, **kwargs)
+                except Exception as e:
+                    if getattr(self, 'debug_bool', False):
+                        raise
+
+                    # Walk to the innermost frame of the coroutine that raised for `response_json`
+                    tb = e.__traceback__
+                    response_json = None
+                    while tb is not None:
+                        if tb.tb_frame.f_code is func.__code__:
+                            response_json = tb.tb_frame.f_locals.get("response_json", None)
+                        tb = tb.tb_next
+
+                    if hasattr(self, 'logger'):
+                        if response_json is not None:
+                            self.logger.error(f"{func.__name__} – LLM Response: {response_json}")
+                        self.logger.error(f"{func.__name__} – Error: {e}")
+
+                    return f"Error in {func.__name__}: {str(e)}\nLLM Response: {response_json}" if response_json else str(e)
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
             try:
@@ -53,12 +90,90 @@ def handle_errors():
     return decorator
 
 
+# Output model and log label for each action prompter, used by the async chain
+ACTION_SPECS = {
+    "introduce": (IntroBM, "Introduce"),
+    "defend": (DefendYourselfBM, "Defend"),
+    "accuse": (AccusePlayerBM, "Accuse"),
+    "joke": (JokeBM, "Joke"),
+    "question": (QuestionBM, "Question"),
+    "simple_phrase": (SimplePhraseBM, "Simple Phrase"),
+    "other": (SimplePhraseBM, "Other"),
+}
+# Every prompter an AIPlayer can build: name -> (examples, prompt headers, output format,
+# main prompt header, temperature, whether it reads the minutes in session mode). Cache, hedging,
+# deadline and rate-limit priority are looked up by name (see AIPlayer._prompter).
+PROMPTER_SPECS = {
+    "decide_to_respond": (DTR_PACK, GENERIC_PROMPT_HEADERS, DecideToRespondBM, DTR_MAIN_HEADER, 0.1, True),
+    "choose_action": (CHOOSE_ACTION_PACK, GENERIC_PROMPT_HEADERS, ActionOptionBM, CHOOSE_ACTION_MAIN_HEADER, 0.1, True),
+    "introduce": (INTRO_PACK, GENERIC_PROMPT_HEADERS, IntroBM, INTRO_MAIN_HEADER, 0.5, True),
+    "stylizer": (STYLIZER_PACK, STYLIZER_HEADERS, StylizerBM, STYLIZER_MAIN_HEADER, 0.1, False),
+    "defend": (DEFEND_PACK, GENERIC_PROMPT_HEADERS, DefendYourselfBM, DEFEND_MAIN_HEADER, 0.5, True),
+    "accuse": (ACCUSE_PACK, GENERIC_PROMPT_HEADERS, AccusePlayerBM, ACCUSE_MAIN_HEADER, 0.5, True),
+    "joke": (JOKE_PACK, GENERIC_PROMPT_HEADERS, JokeBM, JOKE_MAIN_HEADER, 0.5, True),
+    "question": (QUESTION_PACK, GENERIC_PROMPT_HEADERS, QuestionBM, QUESTION_MAIN_HEADER, 0.5, True),
+    "simple_phrase": (SIMPLE_PHRASE_PACK, GENERIC_PROMPT_HEADERS, SimplePhraseBM, SIMPLE_PHRASE_MAIN_HEADER, 0.5, True),
+    "other": (OTHER_PACK, GENERIC_PROMPT_HEADERS, SimplePhraseBM, OTHER_MAIN_HEADER, 0.5, True),
+    # Game summary update prompter
+    "game_summary_update": (GSU_PACK, GSU_HEADERS, GameSummaryBM, GSU_MAIN_HEADER, 0.1, False),
+    # Folds chat lines that left the minutes window into the game summary
+    "summarize_minutes": (ROLLING_SUMMARY_PACK, ROLLING_SUMMARY_HEADERS, GameSummaryBM, ROLLING_SUMMARY_MAIN_HEADER, 0.1, False),
+    # Single-call decision + action + stylized output (response_mode="fused")
+    "fused": (FUSED_PACK, FUSED_HEADERS, FusedResponseBM, FUSED_MAIN_HEADER, 0.5, True),
+}
+# Stages of a chained reply in order, to estimate what a preempted chain never sent
+CHAIN_STAGES = (("decide_to_respond",), ("choose_action",), tuple(ACTION_SPECS), ("stylizer",))
+
+
 class AIPlayer:
     def __init__(
             self, players_code_names: List[str],
             player_to_steal: PlayerState, 
             system_prompt: str = DEFAULT_SYSTEM_PROMPT,
-            debug_bool: bool = False):
+            debug_bool: bool = False,
+            response_mode: str = "chained",
+            speculative: bool = False,
+            triage: bool = False,
+            keep_last: int = MINUTES_KEEP_LAST,
+            token_budget: int = MINUTES_TOKEN_BUDGET,
+            session: bool = False,
+            cache_prompters: Iterable[str] = (),
+            backend: str = LLM_BACKEND,
+            hedge_prompters: Iterable[str] = (),
+            lobby_id: str = ""):
+        """
+        :param response_mode: "chained" runs decide_to_respond -> choose_action -> action ->
+            stylizer (up to four completions). "fused" asks for the decision, action and
+            stylized output_text in one FusedResponseBM completion.
+        :param speculative: In the async chained mode, start choose_action alongside
+            decide_to_respond and cancel it if the decision is not to reply. Saves a round
+            trip on direct replies at the cost of some wasted tokens (see speculation_stats).
+        :param triage: Run the local ResponseTriage on new messages first, skipping the
+            decide_to_respond completion when they are obviously not for this AI.
+        :param keep_last: Latest chat lines sent verbatim; older ones are folded into the game
+            summary by the summarize_minutes prompter. 0 sends the whole log.
+        :param token_budget: Cap on the estimated tokens of the verbatim lines. 0 for no cap.
+        :param session: Build the prompters that read the minutes in session mode (see
+            OpenAIPrompter), sending only new minutes each call. The minutes window is then
+            off, since a sliding window would restart the session on every call.
+        :param cache_prompters: Names of prompters (e.g. "stylizer", "game_summary_update") that
+            answer identical requests from the shared response cache.
+        :param backend: Completion backend for every prompter (see OpenAIPrompter): "openai",
+            "record", "replay" or "stub".
+        :param hedge_prompters: Names of prompters that hedge slow async requests with a
+            duplicate (see OpenAIPrompter). Deadlines come from COMPLETION_DEADLINES.
+        :param lobby_id: Lobby the AI plays in, if not the stolen player's. The shared rate
+            limiter splits capacity fairly between lobbies, then between the AIs in each;
+            priorities come from RATE_LIMIT_PRIORITIES.
+        """
+        if response_mode not in ("chained", "fused"):
+            raise ValueError(f"response_mode must be 'chained' or 'fused', got {response_mode}")
+        # Prompters are built lazily, but the configuration they all need is checked now, so a
+        # missing API key fails at startup rather than as an error reply in the chat
+        check_backend_config(backend)
+        self.response_mode = response_mode
+        self.speculative = speculative
+        self.speculation_stats = {"launched": 0, "hits": 0, "misses": 0, "wasted_tokens": 0}
         self.logger = None # filled in later
         self.prompt_tail = None
         self.players_code_names = players_code_names
@@ -74,107 +189,51 @@ class AIPlayer:
         self.game_summary = self._initialize_game_summary()
         self.debug_bool = debug_bool
         self.player_minutes = [self.player_state.extra_info] if self.player_state.extra_info else []
+        self.triage = ResponseTriage(
+            self.player_state.code_name, self.player_state.first_name, players_code_names
+        ) if triage else None
+        self._triage_cursor = 0  # Number of minutes the triage has already looked at
+        self._triage_start = 0   # Cursor before the latest decision, restored on preemption
+        self.preemption_stats = {"preemptions": 0, "tokens_saved": 0, "tokens_wasted": 0}
+        if session:
+            keep_last = token_budget = 0
+        self.minutes_window = MinutesWindow(keep_last, token_budget, MINUTES_FOLD_BATCH)
+        self._fold_task = None  # Background summarize_minutes completion, if any
 
-        # Initialize custom prompter_dict
-        self.prompter_dict = {
-            "decide_to_respond": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=DTR_EXAMPLES,
-                prompt_headers=GENERIC_PROMPT_HEADERS,
-                output_format=DecideToRespondBM,
-                main_prompt_header=DTR_MAIN_HEADER
-            ),
-            
-            "choose_action": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=CHOSE_ACTION_EXAMPLES,
-                prompt_headers=GENERIC_PROMPT_HEADERS,
-                output_format=ActionOptionBM,
-                main_prompt_header=CHOOSE_ACTION_MAIN_HEADER
-            ),
-            "introduce": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=INTRO_EXAMPLES,
-                prompt_headers=GENERIC_PROMPT_HEADERS,
-                output_format=IntroBM,
-                main_prompt_header=INTRO_MAIN_HEADER,
-                temperature=0.5
-            ),
-            "stylizer": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=STYLIZER_EXAMPLES,
-                prompt_headers=STYLIZER_HEADERS,
-                output_format=StylizerBM,
-                main_prompt_header=STYLIZER_MAIN_HEADER
-            ),
-            "defend": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=DEFEND_EXAMPLES,
-                prompt_headers=GENERIC_PROMPT_HEADERS,
-                output_format=DefendYourselfBM,
-                main_prompt_header=DEFEND_MAIN_HEADER,
-                temperature=0.5
-            ),
-            "accuse": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=ACCUSE_EXAMPLES,
-                prompt_headers=GENERIC_PROMPT_HEADERS,
-                output_format=AccusePlayerBM,
-                main_prompt_header=ACCUSE_MAIN_HEADER,
-                temperature=0.5
-            ),
-            "joke": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=JOKE_EXAMPLES,
-                prompt_headers=GENERIC_PROMPT_HEADERS,
-                output_format=JokeBM,
-                main_prompt_header=JOKE_MAIN_HEADER,
-                temperature=0.5
-            ),
-            "question": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=QUESTION_EXAMPLES,
-                prompt_headers=GENERIC_PROMPT_HEADERS,
-                output_format=QuestionBM,
-                main_prompt_header=QUESTION_MAIN_HEADER,
-                temperature=0.5
-            ),
-            "simple_phrase": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=SIMPLE_PHRASE_EXAMPLES,
-                prompt_headers=GENERIC_PROMPT_HEADERS,
-                output_format=SimplePhraseBM,
-                main_prompt_header=SIMPLE_PHRASE_MAIN_HEADER,
-                temperature=0.5
-            ),
-            "other": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=OTHER_EXAMPLES,  # Reusing simple phrase examples for fallback
-                prompt_headers=GENERIC_PROMPT_HEADERS,
-                output_format=SimplePhraseBM,
-                main_prompt_header=OTHER_MAIN_HEADER,
-                temperature=0.5
-            ),
-             #  Game summary update prompter
-            "game_summary_update": OpenAIPrompter(
-                openai_dict_key="OPENAI_API_KEY",
-                system_prompt=self.system_prompt,
-                examples=GSU_EXAMPLES,
-                prompt_headers=GSU_HEADERS,
-                output_format=GameSummaryBM,
-                main_prompt_header=GSU_MAIN_HEADER
-            )
-        }
+        # Initialize custom prompter_dict. Each prompter is only built the first time it is
+        # looked up, so many games never pay for joke/question/other/game_summary_update.
+        self._backend = backend
+        self._session = session
+        self._cache_prompters = frozenset(cache_prompters)
+        self._hedge_prompters = frozenset(hedge_prompters)
+        self._tenant = (lobby_id or self.player_state.lobby_id, self.player_state.code_name)
+        self.prompter_dict = LazyPrompterRegistry(
+            {name: partial(self._prompter, name) for name in PROMPTER_SPECS})
+
+    def _prompter(self, name: str) -> AsyncOpenAIPrompter:
+        """Builds the named prompter from its PROMPTER_SPECS entry and this AI's settings."""
+        examples, prompt_headers, output_format, main_prompt_header, temperature, uses_session = \
+            PROMPTER_SPECS[name]
+        return AsyncOpenAIPrompter(
+            openai_dict_key="OPENAI_API_KEY",
+            cache=name in self._cache_prompters,
+            backend=self._backend,
+            deadline=COMPLETION_DEADLINES.get(name, COMPLETION_DEADLINE),
+            hedge=name in self._hedge_prompters,
+            rate_limit_priority=RATE_LIMIT_PRIORITIES.get(name, 0),
+            rate_limit_tenant=self._tenant,
+            system_prompt=self.system_prompt,
+            examples=examples,
+            prompt_headers=prompt_headers,
+            output_format=output_format,
+            main_prompt_header=main_prompt_header,
+            session=self._session and uses_session,
+            temperature=temperature
+        )
+
+    def warm(self, names: List[str] = None):
+        """Builds the named prompters (default: all) in a background thread."""
+        return self.prompter_dict.warm(names)
             
     def _initialize_game_summary(self) -> str:
         """Initializes the game summary for the AI player."""
@@ -227,15 +286,83 @@ class AIPlayer:
         stylized_response = StylizerBM.model_validate_json(json.dumps(response_json)).output_text
         return stylized_response
 
+    def _triage(self, minutes: List[str]) -> Tuple[Verdict, List[str]]:
+        """Runs the local triage over the minutes added since the last decision."""
+        cursor = self._triage_cursor if self._triage_cursor <= len(minutes) else 0
+        new_messages = minutes[cursor:] or minutes[-1:]
+        self._triage_start, self._triage_cursor = cursor, len(minutes)
+        if self.triage is None or not self.has_introduced:
+            # Whether to introduce is always up to the LLM
+            return Verdict.ASK_LLM, []
+        verdict, rules = self.triage.classify(new_messages)
+        self.logger.info(f"Triage: {verdict.value} {rules} {self.triage.report()}")
+        return verdict, rules
+
+    def _window(self, minutes: List[str]) -> List[str]:
+        """Returns the minutes to send verbatim, logging the prompt size before and after."""
+        window = self.minutes_window.view(minutes)
+        if len(window) < len(minutes):
+            prompter = self.prompter_dict["fused" if self.response_mode == "fused" else "decide_to_respond"]
+            before = prompter.estimate_prompt_tokens({"minutes": minutes, "game_summary": self.game_summary})
+            after = prompter.estimate_prompt_tokens({"minutes": window, "game_summary": self.game_summary})
+            self.logger.info(
+                f"Minutes window: {len(minutes)} -> {len(window)} lines, "
+                f"~{before} -> ~{after} prompt tokens")
+        return window
+
+    def _apply_fold(self, response_json, upto: int, summary_before) -> None:
+        """Takes the folded textual_summary, leaving the rest of the game summary untouched."""
+        if self.game_summary is not summary_before:
+            return  # The summary was replaced meanwhile (e.g. a vote); fold these lines again later
+        folded = GameSummaryBM.model_validate_json(json.dumps(response_json))
+        current = self.game_summary
+        current = GameSummaryBM.model_validate(current if isinstance(current, dict) else json.loads(current))
+        self.game_summary = current.model_copy(
+            update={"textual_summary": folded.textual_summary}).model_dump_json()
+        self.minutes_window.mark_folded(upto)
+        self.logger.info(
+            f"Folded minutes up to line {upto} into the summary "
+            f"(~{estimate_text_tokens(folded.textual_summary)} tokens)")
+
+    def _fold_minutes(self, minutes: List[str]) -> None:
+        """Folds lines that left the minutes window into the game summary."""
+        batch, upto = self.minutes_window.to_fold(minutes)
+        if not batch:
+            return
+        summary_before = self.game_summary
+        try:
+            response_json = self.prompter_dict["summarize_minutes"].get_completion({
+                "minutes": "\n".join(batch),
+                "game_summary": summary_before
+            })
+            self._apply_fold(response_json, upto, summary_before)
+        except Exception as e:
+            if self.debug_bool:
+                raise
+            self.logger.error(f"summarize_minutes – Error: {e}")
+
+    def _record_triage(self, rules: List[str], responded: bool) -> None:
+        """Feeds the LLM's decision on a batch the triage forwarded back to it."""
+        if self.triage is not None and rules:
+            self.triage.record_llm(rules, responded)
+
     def decide_to_respond(self, minutes: List[str]):
-        print("--- decide_to_respond ---")
         """Determines whether AI should respond and what action to take."""
+        if self.response_mode == "fused":
+            return self.fused_respond(minutes)
+        print("--- decide_to_respond ---")
 
         self._update_player_minutes(minutes)
 
         if not minutes:
             return "Wait for next message"
 
+        verdict, triage_rules = self._triage(minutes)
+        if verdict is Verdict.SKIP:
+            return "Wait for next message"
+        self._fold_minutes(minutes)
+        minutes = self._window(minutes)
+
         try:
             response_json = self.prompter_dict["decide_to_respond"].get_completion({
                 "minutes": minutes,
@@ -250,6 +377,7 @@ class AIPlayer:
             self.logger.error(f"decide_to_respond – Error: {e}")
             return "I'm thinking... let's wait and see what happens next."
 
+        self._record_triage(triage_rules, bool(decision.directed_at_me or decision.accused))
         if not self.has_introduced and decision.havent_indroduced_self:
             self.has_introduced = True
             return self.introduce(minutes)
@@ -260,6 +388,47 @@ class AIPlayer:
         return "Wait for next message"
 
 
+    def _fused_inputs(self, minutes: List[str]) -> dict:
+        return {
+            "minutes": minutes,
+            "game_summary": self.game_summary,
+            "player_minutes": self.player_minutes
+        }
+
+    def _handle_fused_response(self, response_json, triage_rules: List[str]) -> str:
+        """Turns a FusedResponseBM completion into the chat message (or a wait marker)."""
+        self.logger.info(f"Fused JSON: {response_json}")
+        response = FusedResponseBM.model_validate_json(json.dumps(response_json))
+        self._record_triage(triage_rules, bool(response.should_respond and response.output_text))
+        if not response.should_respond or not response.output_text:
+            return "Wait for next message"
+        if response.action == "introduce" or response.havent_introduced_self:
+            self.has_introduced = True
+        return response.output_text
+
+    def fused_respond(self, minutes: List[str]):
+        """Decides, picks an action and writes the stylized reply in a single completion."""
+        print("--- FUSED RESPOND ---")
+        self._update_player_minutes(minutes)
+
+        if not minutes:
+            return "Wait for next message"
+        verdict, triage_rules = self._triage(minutes)
+        if verdict is Verdict.SKIP:
+            return "Wait for next message"
+        self._fold_minutes(minutes)
+        minutes = self._window(minutes)
+
+        try:
+            response_json = self.prompter_dict["fused"].get_completion(self._fused_inputs(minutes))
+            return self._handle_fused_response(response_json, triage_rules)
+        except Exception as e:
+            if self.debug_bool:
+                raise
+            self.logger.error(f"fused_respond – LLM Response: {locals().get('response_json')}")
+            self.logger.error(f"fused_respond – Error: {e}")
+            return "I'm thinking... let's wait and see what happens next."
+
     def choose_action(self, minutes: List[str]):
         print("--- CHOOSE ACTION ---")
         try:
@@ -395,4 +564,294 @@ class AIPlayer:
         updated_game_summary = GameSummaryBM.model_validate_json(json.dumps(response_json))
         self.game_summary = json.loads(updated_game_summary.model_dump_json())
 
+    # === Async action chain ===
+    # Mirrors decide_to_respond -> choose_action -> <action> -> _stylize_output, but awaits
+    # every completion so the event loop keeps serving input and refreshes meanwhile.
+
+    async def _astylize_output(self, before_styling: str) -> str:
+        """Async version of _stylize_output."""
+        response_json = await self.prompter_dict["stylizer"].aget_completion({
+            "input_text": before_styling,
+            "player_minutes": self.player_minutes
+        })
+        self.logger.info(f"Stylized JSON: {response_json}")
+        stylized_response = StylizerBM.model_validate_json(json.dumps(response_json)).output_text
+        return stylized_response
+
+    def _schedule_fold(self, minutes: List[str]) -> None:
+        """Starts folding lines that left the minutes window in the background, one fold at a time."""
+        if self._fold_task is not None and not self._fold_task.done():
+            return
+        batch, upto = self.minutes_window.to_fold(minutes)
+        if batch:
+            self._fold_task = asyncio.create_task(self._afold_minutes(batch, upto))
+
+    async def _afold_minutes(self, batch: List[str], upto: int) -> None:
+        """Async version of _fold_minutes, run as a background task."""
+        summary_before = self.game_summary
+        try:
+            response_json = await self.prompter_dict["summarize_minutes"].aget_completion({
+                "minutes": "\n".join(batch),
+                "game_summary": summary_before
+            })
+            self._apply_fold(response_json, upto, summary_before)
+        except Exception as e:
+            if self.debug_bool:
+                raise
+            self.logger.error(f"summarize_minutes – Error: {e}")
+
+    async def _aspeculative_choice(self, minutes: List[str]) -> Tuple[dict, int]:
+        """Runs the choose_action completion; returns its JSON and the tokens it used."""
+        prompter = self.prompter_dict["choose_action"]
+        wasted_before = prompter.usage_stats["cancelled_wasted_tokens"]
+        try:
+            response = await prompter.aget_completion({
+                "minutes": minutes,
+                "game_summary": self.game_summary
+            }, parse=False)
+        except asyncio.CancelledError:
+            # Same rule as apreempt: only the prompt of a request already sent is wasted
+            self.speculation_stats["wasted_tokens"] += prompter.usage_stats["cancelled_wasted_tokens"] - wasted_before
+            raise
+        usage = getattr(response, "usage", None)
+        return prompter.parse_output(response), getattr(usage, "total_tokens", 0)
+
+    def _start_speculation(self, minutes: List[str]) -> Tuple[asyncio.Task, int]:
+        """Starts choose_action ahead of the decision. Returns the task and its estimated prompt tokens."""
+        estimate = self.prompter_dict["choose_action"].estimate_prompt_tokens({
+            "minutes": minutes,
+            "game_summary": self.game_summary
+        })
+        self.speculation_stats["launched"] += 1
+        return asyncio.create_task(self._aspeculative_choice(minutes)), estimate
+
+    def _discard_speculation(self, speculation: Tuple[asyncio.Task, int]) -> None:
+        """
+        Cancels a speculative choose_action that was not needed and counts what it cost: all of
+        it if it had finished, otherwise what _aspeculative_choice counts as it is cancelled.
+        """
+        task, estimate = speculation
+        self.speculation_stats["misses"] += 1
+        if task.done() and not task.cancelled() and task.exception() is None:
+            self.speculation_stats["wasted_tokens"] += task.result()[1] or estimate
+        else:
+            task.cancel()
+
+    @property
+    def speculation_hit_rate(self) -> float:
+        launched = self.speculation_stats["launched"]
+        return self.speculation_stats["hits"] / launched if launched else 0.0
+
+    def is_relevant(self, new_messages: List[str]) -> bool:
+        """Whether new messages could change this AI's reply (anything the triage would not skip)."""
+        own_prefix = f"{self.player_state.code_name}:"
+        others = [m for m in new_messages if not m.startswith(own_prefix)]
+        if self.triage is None:
+            return bool(others)
+        return any(self.triage.classify_message(m)[0] is not Verdict.SKIP for m in others)
+
+    def usage_report(self) -> dict:
+        """Token usage summed over every prompter built so far, with the prompt-cache hit rate."""
+        totals = {}
+        response_cache = None
+        for name in self.prompter_dict.built:
+            prompter = self.prompter_dict[name]
+            response_cache = response_cache or prompter.response_cache
+            for key, value in prompter.usage_stats.items():
+                totals[key] = totals.get(key, 0) + value
+        prompt_tokens = totals.get("prompt_tokens", 0)
+        totals["cache_hit_rate"] = round(totals.get("cached_tokens", 0) / prompt_tokens, 3) if prompt_tokens else 0.0
+        if response_cache is not None:
+            totals["response_cache"] = response_cache.report()
+        return totals
+
+    def latency_report(self) -> dict:
+        """Retries, timeouts, hedges and latency percentiles of every prompter built so far."""
+        return {name: self.prompter_dict[name].policy.report() for name in self.prompter_dict.built}
+
+    def _cancelled_stats(self) -> Dict[str, Tuple[int, int, int]]:
+        """(cancelled requests, wasted tokens, saved tokens) of every prompter built so far."""
+        stats = {}
+        for name in self.prompter_dict.built:
+            usage = self.prompter_dict[name].usage_stats
+            stats[name] = (usage["cancelled"], usage["cancelled_wasted_tokens"], usage["cancelled_saved_tokens"])
+        return stats
+
+    def _unsent_stage_tokens(self, cancelled: List[str]) -> int:
+        """
+        Estimated prompts of the chain stages after the latest one cancelled, which a preempted
+        chain never sent. Each stage costs its prompters' average prompt so far (0 if unknown).
+        """
+        reached = [i for i, names in enumerate(CHAIN_STAGES) if any(name in names for name in cancelled)]
+        if not reached:
+            return 0
+        total = 0
+        for names in CHAIN_STAGES[max(reached) + 1:]:
+            means = [self.prompter_dict[name].mean_prompt_tokens() for name in names if name in self.prompter_dict.built]
+            means = [mean for mean in means if mean]
+            total += sum(means) // len(means) if means else 0
+        return total
+
+    async def apreempt(self, generation: asyncio.Task) -> int:
+        """
+        Cancels an in-flight adecide_to_respond task, including its HTTP request, so it can be
+        restarted with fresh minutes. Returns the estimated tokens saved: the completions of
+        the cancelled requests (and the prompts of any not sent yet) plus the prompts of the
+        chain stages that were never reached. Prompts already sent are billed anyway and
+        counted as wasted instead, as _discard_speculation does.
+        """
+        before = self._cancelled_stats()
+        generation.cancel()
+        await asyncio.wait({generation})
+        after = self._cancelled_stats()
+        zero = (0, 0, 0)
+        cancelled = [name for name in after if after[name][0] > before.get(name, zero)[0]]
+        wasted = sum(after[name][1] - before.get(name, zero)[1] for name in cancelled)
+        saved = sum(after[name][2] - before.get(name, zero)[2] for name in cancelled)
+        saved += self._unsent_stage_tokens(cancelled)
+        # The stale chain never answered its messages, so the triage should see them again
+        self._triage_cursor = self._triage_start
+        self.preemption_stats["preemptions"] += 1
+        self.preemption_stats["tokens_saved"] += saved
+        self.preemption_stats["tokens_wasted"] += wasted
+        self.logger.info(f"Preempted stale generation: {self.preemption_stats}")
+        return saved
+
+    async def adecide_to_respond(self, minutes: List[str]):
+        """Async version of decide_to_respond."""
+        if self.response_mode == "fused":
+            return await self.afused_respond(minutes)
+        print("--- decide_to_respond ---")
+        self._update_player_minutes(minutes)
+
+        if not minutes:
+            return "Wait for next message"
+
+        verdict, triage_rules = self._triage(minutes)
+        if verdict is Verdict.SKIP:
+            return "Wait for next message"
+        self._schedule_fold(minutes)
+        minutes = self._window(minutes)
+
+        speculation = self._start_speculation(minutes) if self.speculative else None
+        settled = False  # Whether the speculation was used or discarded already
+        try:
+            try:
+                response_json = await self.prompter_dict["decide_to_respond"].aget_completion({
+                    "minutes": minutes,
+                    "game_summary": self.game_summary
+                })
+                self.logger.info(f"DTR JSON: {response_json}")
+                decision = DecideToRespondBM.model_validate_json(json.dumps(response_json))
+            except Exception as e:
+                if self.debug_bool:
+                    raise
+                self.logger.error(f"decide_to_respond – LLM Response: {locals().get('response_json')}")
+                self.logger.error(f"decide_to_respond – Error: {e}")
+                return "I'm thinking... let's wait and see what happens next."
+
+            self._record_triage(triage_rules, bool(decision.directed_at_me or decision.accused))
+            introduce = not self.has_introduced and decision.havent_indroduced_self
+            choose = not introduce and (decision.directed_at_me or decision.accused)
+            if speculation is not None:
+                # Settle the speculation now, so an unneeded one stops costing tokens right away
+                settled = True
+                if choose:
+                    self.speculation_stats["hits"] += 1
+                else:
+                    self._discard_speculation(speculation)
+
+            if introduce:
+                # Only marked once the intro is written, in case this call is preempted
+                introduction = await self.aact("introduce", minutes)
+                self.has_introduced = True
+                return introduction
+
+            if choose:
+                return await self.achoose_action(minutes, pending=speculation and speculation[0])
+
+            return "Wait for next message"
+        finally:
+            if speculation is not None:
+                if not settled:
+                    self._discard_speculation(speculation)
+                self.logger.info(
+                    f"Speculation: {self.speculation_stats} "
+                    f"(hit rate {self.speculation_hit_rate:.0%})"
+                )
+
+    async def afused_respond(self, minutes: List[str]):
+        """Async version of fused_respond."""
+        print("--- FUSED RESPOND ---")
+        self._update_player_minutes(minutes)
+
+        if not minutes:
+            return "Wait for next message"
+        verdict, triage_rules = self._triage(minutes)
+        if verdict is Verdict.SKIP:
+            return "Wait for next message"
+        self._schedule_fold(minutes)
+        minutes = self._window(minutes)
+
+        try:
+            response_json = await self.prompter_dict["fused"].aget_completion(
+                self._fused_inputs(minutes))
+            return self._handle_fused_response(response_json, triage_rules)
+        except Exception as e:
+            if self.debug_bool:
+                raise
+            self.logger.error(f"fused_respond – LLM Response: {locals().get('response_json')}")
+            self.logger.error(f"fused_respond – Error: {e}")
+            return "I'm thinking... let's wait and see what happens next."
+
+    async def achoose_action(self, minutes: List[str], pending: asyncio.Task = None):
+        """
+        Async version of choose_action.
+        :param pending: A speculative choose_action task already started with these minutes.
+        """
+        print("--- CHOOSE ACTION ---")
+        try:
+            if pending is not None:
+                response_json, _ = await pending
+            else:
+                response_json = await self.prompter_dict["choose_action"].aget_completion({
+                    "minutes": minutes,
+                    "game_summary": self.game_summary
+                })
+            self.logger.info(f"Action Choice JSON: {response_json}")
+            action = ActionOptionBM.model_validate_json(json.dumps(response_json))
+        except Exception as e:
+            if self.debug_bool:
+                raise
+            self.logger.error(f"choose_action – LLM Response: {locals().get('response_json')}")
+            self.logger.error(f"choose_action – Error: {e}")
+            return "Sorry, I got confused about what to say next."
+
+        if action.defend:
+            return await self.aact("defend", minutes)
+        elif action.accuse:
+            return await self.aact("accuse", minutes)
+        elif action.joke:
+            return await self.aact("joke", minutes)
+        elif action.question:
+            return await self.aact("question", minutes)
+        else:
+            return await self.aact("other", minutes)
+
+    @handle_errors()
+    async def aact(self, action: str, minutes: List[str]):
+        """Runs one action prompter (see ACTION_SPECS) and stylizes its output."""
+        output_format, label = ACTION_SPECS[action]
+        print(f"--- {label.upper()} ---")
+        response_json = await self.prompter_dict[action].aget_completion({
+            "minutes": minutes,
+            "game_summary": self.game_summary
+        })
+        self.logger.info(f"{label} JSON: {response_json}")
+        if action == "introduce":
+            self.has_introduced = True
+        output = output_format.model_validate_json(json.dumps(response_json)).output_text
+        stylized_output = await self._astylize_output(output)
+        return stylized_output
+
     
\ No newline at end of file
@@ -0,0 +1,268 @@
+from abc import ABC, abstractmethod
+import asyncio
+from enum import Enum
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Literal, Optional, Set, Tuple, Union, get_args, get_origin
+
+from openai.types.chat import ChatCompletion
+from pydantic import BaseModel
+
+from .response_cache import cache_key
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when the cassette has no response for a request."""
+
+
+def request_key(request: dict) -> str:
+    return cache_key(
+        request["model"], request["temperature"], request["messages"], request["response_format"])
+
+
+def _sample_value(annotation, name: str, rng: random.Random):
+    origin = get_origin(annotation)
+    if origin is Literal:
+        return rng.choice(get_args(annotation))
+    if origin is Union:
+        options = [a for a in get_args(annotation) if a is not type(None)]
+        return _sample_value(options[0], name, rng) if options else None
+    if origin in (list, List):
+        (item,) = get_args(annotation) or (str,)
+        return [_sample_value(item, name, rng) for _ in range(rng.randint(1, 3))]
+    if origin in (tuple, Tuple):
+        return [_sample_value(item, name, rng) for item in get_args(annotation) if item is not Ellipsis]
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return sample_output(annotation, rng)
+        if issubclass(annotation, Enum):
+            return rng.choice(list(annotation)).value
+        if annotation is bool:
+            return rng.random() < 0.5
+        if annotation is int:
+            return rng.randint(0, 5)
+        if annotation is float:
+            return round(rng.random(), 2)
+    return f"stub {name} {rng.randint(0, 999)}"
+
+
+def sample_output(output_format, rng: Optional[random.Random] = None) -> dict:
+    """
+    Returns a dict that validates as `output_format`, with values drawn from `rng`
+    (strings like "stub output_text 123", random booleans and small numbers).
+    """
+    rng = rng or random.Random(0)
+    sample = {
+        name: _sample_value(field.annotation, name, rng)
+        for name, field in output_format.model_fields.items()
+    }
+    return output_format.model_validate(sample).model_dump(mode="json")
+
+
+def make_completion(content: str, model: str, prompt_tokens: int = 0) -> ChatCompletion:
+    """Wraps a message body in a chat.completion response object."""
+    completion_tokens = len(content) // 4 + 1
+    return ChatCompletion.model_validate({
+        "id": f"chatcmpl-local-{random.getrandbits(32):08x}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": content}
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    })
+
+
+# === Base Backend Class ===
+class CompletionBackend(ABC):
+    """
+    Where an OpenAIPrompter sends its chat.completions requests. `request` holds the
+    create() arguments; `route` names the prompter's output format. `timeout` bounds a
+    synchronous request in seconds (async callers cancel instead).
+    """
+
+    @abstractmethod
+    def create(self, request: dict, route: str, timeout: Optional[float] = None) -> ChatCompletion:
+        pass
+
+    @abstractmethod
+    async def acreate(self, request: dict, route: str) -> ChatCompletion:
+        pass
+
+
+class OpenAIBackend(CompletionBackend):
+    """Calls the OpenAI API through the shared clients."""
+
+    def __init__(self, client, async_client=None):
+        self.client = client
+        self.async_client = async_client
+
+    def create(self, request: dict, route: str, timeout: Optional[float] = None) -> ChatCompletion:
+        if timeout is None:
+            return self.client.chat.completions.create(**request)
+        return self.client.chat.completions.create(**request, timeout=timeout)
+
+    async def acreate(self, request: dict, route: str) -> ChatCompletion:
+        return await self.async_client.chat.completions.create(**request)
+
+
+class Cassette:
+    """
+    A JSONL file of recorded request/response pairs, one object per line with the request
+    key, the route, the request, the raw response and the latency it took.
+    """
+    _instances: Dict[str, "Cassette"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._by_key: Dict[str, List[dict]] = {}
+        self._by_route: Dict[str, List[dict]] = {}
+        self._cursor: Dict[int, int] = {}  # id(entry list) -> index of its first unused entry
+        self._used: Set[int] = set()  # id(entry) of every entry served so far
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+
+    @classmethod
+    def get_instance(cls, path: str) -> "Cassette":
+        with cls._instances_lock:
+            if path not in cls._instances:
+                cls._instances[path] = cls(path)
+            return cls._instances[path]
+
+    def _index(self, entry: dict) -> None:
+        self._by_key.setdefault(entry["key"], []).append(entry)
+        self._by_route.setdefault(entry["route"], []).append(entry)
+
+    def record(self, request: dict, route: str, response: ChatCompletion, latency: float) -> None:
+        entry = {
+            "key": request_key(request),
+            "route": route,
+            "latency": round(latency, 4),
+            "request": request,
+            "response": response.model_dump(mode="json"),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._index(entry)
+
+    def _next_unused(self, entries: Optional[List[dict]]) -> Optional[dict]:
+        """Takes the first entry of the list (in recording order) not served yet."""
+        if not entries:
+            return None
+        i = self._cursor.get(id(entries), 0)
+        while i < len(entries) and id(entries[i]) in self._used:
+            i += 1
+        self._cursor[id(entries)] = i
+        if i == len(entries):
+            return None
+        self._used.add(id(entries[i]))
+        return entries[i]
+
+    def lookup(self, request: dict, route: str) -> dict:
+        """
+        Returns the recorded entry for a request: an unused exact match if there is one,
+        otherwise the next unused recording for the same route (prompts differ run to run,
+        e.g. the AI's assigned code name). Every recording is served once, in recording
+        order; raises CassetteMiss once none is left.
+        """
+        with self._lock:
+            entry = self._next_unused(self._by_key.get(request_key(request)))
+            if entry is None:
+                entry = self._next_unused(self._by_route.get(route))
+        if entry is None:
+            raise CassetteMiss(f"No unused recorded response for route {route} in {self.path}")
+        return entry
+
+
+class RecordingBackend(CompletionBackend):
+    """Forwards to another backend and appends every request/response pair to a cassette."""
+
+    def __init__(self, inner: CompletionBackend, cassette: Cassette):
+        self.inner = inner
+        self.cassette = cassette
+
+    def create(self, request: dict, route: str, timeout: Optional[float] = None) -> ChatCompletion:
+        started = time.perf_counter()
+        response = self.inner.create(request, route, timeout)
+        self.cassette.record(request, route, response, time.perf_counter() - started)
+        return response
+
+    async def acreate(self, request: dict, route: str) -> ChatCompletion:
+        started = time.perf_counter()
+        response = await self.inner.acreate(request, route)
+        self.cassette.record(request, route, response, time.perf_counter() - started)
+        return response
+
+
+class ReplayBackend(CompletionBackend):
+    """
+    Serves responses from a cassette without touching the network. Each one is delayed by
+    its recorded latency times `latency_scale` (0 replays instantly).
+    """
+
+    def __init__(self, cassette: Cassette, latency_scale: float = 1.0):
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+
+    def _replay(self, request: dict, route: str) -> Tuple[ChatCompletion, float]:
+        entry = self.cassette.lookup(request, route)
+        return ChatCompletion.model_validate(entry["response"]), entry["latency"] * self.latency_scale
+
+    def create(self, request: dict, route: str, timeout: Optional[float] = None) -> ChatCompletion:
+        response, delay = self._replay(request, route)
+        if delay > 0:
+            time.sleep(delay)
+        return response
+
+    async def acreate(self, request: dict, route: str) -> ChatCompletion:
+        response, delay = self._replay(request, route)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return response
+
+
+class StubBackend(CompletionBackend):
+    """
+    Answers every request with schema-valid JSON for the prompter's output format.
+    The values are seeded by the request, so the same request always gets the same answer.
+    """
+
+    def __init__(self, output_format, latency: float = 0.0, seed: int = 0):
+        self.output_format = output_format
+        self.latency = latency
+        self.seed = seed
+
+    def _respond(self, request: dict) -> ChatCompletion:
+        key = request_key(request)
+        rng = random.Random(int(key[:16], 16) ^ self.seed)
+        content = json.dumps(sample_output(self.output_format, rng))
+        prompt_tokens = sum(len(m["content"]) // 4 + 1 for m in request["messages"])
+        return make_completion(content, request["model"], prompt_tokens)
+
+    def create(self, request: dict, route: str, timeout: Optional[float] = None) -> ChatCompletion:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        return self._respond(request)
+
+    async def acreate(self, request: dict, route: str) -> ChatCompletion:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return self._respond(request)
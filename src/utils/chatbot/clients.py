@@ -0,0 +1,131 @@
+import threading
+from typing import Optional
+
+import httpx
+import openai
+
+MAX_CONNECTIONS = 20            # Hard cap on open connections per pool
+MAX_KEEPALIVE_CONNECTIONS = 10  # Idle connections kept warm for reuse
+KEEPALIVE_EXPIRY = 60.0         # Seconds an idle connection is kept before closing
+REQUEST_TIMEOUT = 60.0
+MAX_RETRIES = 0                 # Retries are up to each prompter's CompletionPolicy
+
+
+class PoolStats:
+    """Counts requests and new TCP connections so the reuse ratio can be checked."""
+    def __init__(self):
+        self.requests = 0
+        self.new_connections = 0
+        self._lock = threading.Lock()
+
+    def on_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def on_trace(self, event: str) -> None:
+        if event == "connection.connect_tcp.started":
+            with self._lock:
+                self.new_connections += 1
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests that went out on an already-open connection."""
+        if self.requests == 0:
+            return 0.0
+        return max(0.0, 1 - self.new_connections / self.requests)
+
+
+class ClientRegistry:
+    """
+    A singleton holding one sync and one async OpenAI client per (api_key, base_url).
+
+    Every prompter in the process asks the registry for its client instead of building
+    its own, so all of them share a bounded keep-alive connection pool and pay for TLS
+    handshakes once.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super().__new__(cls)
+                cls._instance._clients = {}         # (api_key, base_url) -> openai.Client
+                cls._instance._async_clients = {}   # (api_key, base_url) -> openai.AsyncClient
+                cls._instance._http_clients = []
+                cls._instance.stats = PoolStats()
+        return cls._instance
+
+    @staticmethod
+    def get_instance() -> "ClientRegistry":
+        return ClientRegistry()
+
+    @staticmethod
+    def _limits() -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY
+        )
+
+    def _trace(self, event: str, info: dict) -> None:
+        self.stats.on_trace(event)
+
+    async def _atrace(self, event: str, info: dict) -> None:
+        self.stats.on_trace(event)
+
+    def _on_request(self, request: httpx.Request) -> None:
+        self.stats.on_request()
+        request.extensions["trace"] = self._trace
+
+    async def _aon_request(self, request: httpx.Request) -> None:
+        self.stats.on_request()
+        request.extensions["trace"] = self._atrace
+
+    def get_client(self, api_key: str, base_url: Optional[str] = None) -> openai.Client:
+        """Returns the shared synchronous client for this key and endpoint."""
+        key = (api_key, base_url)
+        with self._lock:
+            if key not in self._clients:
+                http_client = httpx.Client(
+                    limits=self._limits(), timeout=REQUEST_TIMEOUT,
+                    event_hooks={"request": [self._on_request]}
+                )
+                self._http_clients.append(http_client)
+                self._clients[key] = openai.Client(
+                    api_key=api_key, base_url=base_url, http_client=http_client,
+                    max_retries=MAX_RETRIES)
+            return self._clients[key]
+
+    def get_async_client(self, api_key: str, base_url: Optional[str] = None) -> openai.AsyncClient:
+        """Returns the shared asynchronous client for this key and endpoint."""
+        key = (api_key, base_url)
+        with self._lock:
+            if key not in self._async_clients:
+                http_client = httpx.AsyncClient(
+                    limits=self._limits(), timeout=REQUEST_TIMEOUT,
+                    event_hooks={"request": [self._aon_request]}
+                )
+                self._http_clients.append(http_client)
+                self._async_clients[key] = openai.AsyncClient(
+                    api_key=api_key, base_url=base_url, http_client=http_client,
+                    max_retries=MAX_RETRIES)
+            return self._async_clients[key]
+
+    def open_connections(self) -> int:
+        """Number of connections currently held open across all pools."""
+        total = 0
+        for http_client in self._http_clients:
+            pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+            total += len(getattr(pool, "connections", []))
+        return total
+
+    def pool_stats(self) -> dict:
+        return {
+            "clients": len(self._clients) + len(self._async_clients),
+            "open_connections": self.open_connections(),
+            "requests": self.stats.requests,
+            "new_connections": self.stats.new_connections,
+            "reuse_ratio": round(self.stats.reuse_ratio, 3),
+        }
+
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Optional, Tuple
+from typing import List, Literal, Optional, Tuple
 from pydantic import BaseModel, Field, field_validator, model_validator
 
 class GameState(Enum):
@@ -54,6 +54,19 @@ class ActionOptionBM(BaseModel):
     #     return values
 
 
+class FusedResponseBM(BaseModel):
+    # Decision (as in DecideToRespondBM)
+    directed_at_me: Optional[bool] = False
+    havent_introduced_self: Optional[bool] = False
+    accused: Optional[bool] = False
+    should_respond: bool = False
+    # Chosen action, None when not responding
+    action: Optional[Literal[
+        "introduce", "defend", "accuse", "joke", "question", "simple_phrase", "other"
+    ]] = None
+    reasoning: str  # Explanation for the decision and the action
+    output_text: Optional[str] = None  # Final chat message, already in the player's style
+
 class IntroBM(BaseModel):
     reasoning: str  # Explanation for why this action was chosen
     output_text: str  # The AI's output for the chat
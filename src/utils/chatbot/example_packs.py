@@ -0,0 +1,42 @@
+from .prompter import compile_example_pack
+from .examples import (
+    GENERIC_PROMPT_HEADERS, CHOOSE_ACTION_MAIN_HEADER, CHOSE_ACTION_EXAMPLES,
+    DEFEND_MAIN_HEADER, DEFEND_EXAMPLES, ACCUSE_MAIN_HEADER, ACCUSE_EXAMPLES,
+    DTR_EXAMPLES, DTR_MAIN_HEADER, GSU_HEADERS, INTRO_EXAMPLES, INTRO_MAIN_HEADER, JOKE_MAIN_HEADER,
+    JOKE_EXAMPLES, OTHER_EXAMPLES, OTHER_MAIN_HEADER, QUESTION_MAIN_HEADER, QUESTION_EXAMPLES,
+    SIMPLE_PHRASE_MAIN_HEADER, SIMPLE_PHRASE_EXAMPLES, GSU_MAIN_HEADER, GSU_EXAMPLES,
+    STYLIZER_EXAMPLES, STYLIZER_HEADERS, STYLIZER_MAIN_HEADER, FUSED_EXAMPLES, FUSED_HEADERS,
+    FUSED_MAIN_HEADER, ROLLING_SUMMARY_EXAMPLES, ROLLING_SUMMARY_HEADERS, ROLLING_SUMMARY_MAIN_HEADER
+)
+from .enums_dcs import (
+    IntroBM, JokeBM, QuestionBM, SimplePhraseBM, StylizerBM, ActionOptionBM, DecideToRespondBM,
+    DefendYourselfBM, AccusePlayerBM, GameSummaryBM, FusedResponseBM
+)
+
+# Every *_EXAMPLES list rendered once at import, shared by every prompter of every AIPlayer
+DTR_PACK = compile_example_pack(
+    DTR_EXAMPLES, GENERIC_PROMPT_HEADERS, DecideToRespondBM, DTR_MAIN_HEADER)
+CHOOSE_ACTION_PACK = compile_example_pack(
+    CHOSE_ACTION_EXAMPLES, GENERIC_PROMPT_HEADERS, ActionOptionBM, CHOOSE_ACTION_MAIN_HEADER)
+INTRO_PACK = compile_example_pack(
+    INTRO_EXAMPLES, GENERIC_PROMPT_HEADERS, IntroBM, INTRO_MAIN_HEADER)
+STYLIZER_PACK = compile_example_pack(
+    STYLIZER_EXAMPLES, STYLIZER_HEADERS, StylizerBM, STYLIZER_MAIN_HEADER)
+DEFEND_PACK = compile_example_pack(
+    DEFEND_EXAMPLES, GENERIC_PROMPT_HEADERS, DefendYourselfBM, DEFEND_MAIN_HEADER)
+ACCUSE_PACK = compile_example_pack(
+    ACCUSE_EXAMPLES, GENERIC_PROMPT_HEADERS, AccusePlayerBM, ACCUSE_MAIN_HEADER)
+JOKE_PACK = compile_example_pack(
+    JOKE_EXAMPLES, GENERIC_PROMPT_HEADERS, JokeBM, JOKE_MAIN_HEADER)
+QUESTION_PACK = compile_example_pack(
+    QUESTION_EXAMPLES, GENERIC_PROMPT_HEADERS, QuestionBM, QUESTION_MAIN_HEADER)
+SIMPLE_PHRASE_PACK = compile_example_pack(
+    SIMPLE_PHRASE_EXAMPLES, GENERIC_PROMPT_HEADERS, SimplePhraseBM, SIMPLE_PHRASE_MAIN_HEADER)
+OTHER_PACK = compile_example_pack(
+    OTHER_EXAMPLES, GENERIC_PROMPT_HEADERS, SimplePhraseBM, OTHER_MAIN_HEADER)
+GSU_PACK = compile_example_pack(
+    GSU_EXAMPLES, GSU_HEADERS, GameSummaryBM, GSU_MAIN_HEADER)
+FUSED_PACK = compile_example_pack(
+    FUSED_EXAMPLES, FUSED_HEADERS, FusedResponseBM, FUSED_MAIN_HEADER)
+ROLLING_SUMMARY_PACK = compile_example_pack(
+    ROLLING_SUMMARY_EXAMPLES, ROLLING_SUMMARY_HEADERS, GameSummaryBM, ROLLING_SUMMARY_MAIN_HEADER)
@@ -2,7 +2,7 @@ import json
 from .prompter import QAs
 from .enums_dcs import (
     DefenseChoices, AccusePlayerBM, ActionOptionBM, DecideToRespondBM, DefendYourselfBM, 
-    GameSummaryBM, IntroBM, JokeBM, OtherBM, PersonaBM, QuestionBM, SimplePhraseBM, StylizerBM
+    FusedResponseBM, GameSummaryBM, IntroBM, JokeBM, OtherBM, PersonaBM, QuestionBM, SimplePhraseBM, StylizerBM
     )
 
 DEFAULT_SYSTEM_PROMPT = (
@@ -1336,3 +1336,137 @@ GSU_EXAMPLES = [
         )
     )
 ]
+
+FUSED_HEADERS = {
+    "minutes": "Here is the conversation so far this round\nMINUTES:\n",
+    "game_summary": "\n\nHere is the current game state\nGAME STATE:\n",
+    "player_minutes": "\n\nHere are example messages to match the style of\nEXAMPLES:\n"
+}
+FUSED_MAIN_HEADER = (
+    "Given the current minutes and game state, decide whether to respond. Only respond if "
+    "the latest message is directed at you, you have been accused, or you haven't introduced "
+    "yourself yet. If you respond, choose one action (introduce, defend, accuse, joke, question, "
+    "simple_phrase or other) and write the message you would send. Write output_text in the "
+    "style of the example messages, matching their punctuation, capitalization, spelling and tone. "
+    "If you do not respond, set should_respond to false and leave output_text empty."
+)
+FUSED_EXAMPLES = [
+    # Haven't introduced -> introduce
+    QAs(
+        question={
+            "minutes": "\n".join([
+                "Han Solo: Hey this is Alice.",
+                "Skywalker: Yo, I'm Bob."
+            ]),
+            "game_summary": GameSummaryBM(
+                round_number=0,
+                players_alive=human_code_names + ai_code_names,
+                players_voted_off=[],
+                last_vote_outcome="N/A",
+                textual_summary="The game has just started. No events have occurred yet."
+            ).model_dump_json(),
+            "player_minutes": "\n".join([
+                "Leia: bruh this game finna be wild",
+                "Leia: nah fr we gotta lock in"
+            ])
+        },
+        answer=FusedResponseBM(
+            havent_introduced_self=True,
+            should_respond=True,
+            action="introduce",
+            reasoning="My code name is VADER and I haven't introduced myself yet. Han Solo already goes by Alice, so I need a different name.",
+            output_text="yo its charlie lol"
+        )
+    ),
+    # Accused -> defend
+    QAs(
+        question={
+            "minutes": "\n".join([
+                "Han Solo: Bruh, I SWEAR VADER is an AI.",
+                "Skywalker: Wait fr?"
+            ]),
+            "game_summary": GameSummaryBM(
+                round_number=2,
+                players_alive=["Han Solo", "Skywalker", "VADER", "Leia"],
+                players_voted_off=["Maul", "Jaba"],
+                last_vote_outcome="Jaba was voted off as an AI imposter.",
+                textual_summary="Han Solo is accusing VADER, and Skywalker is considering it."
+            ).model_dump_json(),
+            "player_minutes": "\n".join([
+                "Leia: I think it's time to begin.",
+                "Leia: We should probably get going."
+            ])
+        },
+        answer=FusedResponseBM(
+            accused=True,
+            should_respond=True,
+            action="defend",
+            reasoning="Han Solo accused me (VADER). If I stay quiet Skywalker might side with him.",
+            output_text="That is not true. Skywalker has been very quiet, why are you focusing on me?"
+        )
+    ),
+    # Not for me -> stay quiet
+    QAs(
+        question={
+            "minutes": "\n".join([
+                "Han Solo: Skywalker what's your favorite food?",
+                "Skywalker: tacos obviously"
+            ]),
+            "game_summary": GameSummaryBM(
+                round_number=1,
+                players_alive=human_code_names + ai_code_names,
+                players_voted_off=[],
+                last_vote_outcome="N/A",
+                textual_summary="Everyone has introduced themselves. Players are chatting about food."
+            ).model_dump_json(),
+            "player_minutes": "\n".join([
+                "Leia: bet bet let's do itttt",
+                "Leia: dude idk what's goin on lol"
+            ])
+        },
+        answer=FusedResponseBM(
+            should_respond=False,
+            reasoning="The conversation is between Han Solo and Skywalker and nobody asked me (VADER) anything."
+        )
+    ),
+]
+
+ROLLING_SUMMARY_HEADERS = {
+    "minutes": "Here are older messages from this round that no longer fit in the minutes\nMINUTES:\n",
+    "game_summary": "\n\nHere is the current game state\nGAME STATE:\n"
+}
+ROLLING_SUMMARY_MAIN_HEADER = (
+    "Given the older messages and the current game state, fold the messages into the game "
+    "state's textual_summary. Keep round_number, players_alive, players_voted_off and "
+    "last_vote_outcome exactly as they are. Keep what matters for the game: who accused or "
+    "defended whom, questions left unanswered, and what players revealed about themselves. "
+    "Keep the summary short."
+)
+ROLLING_SUMMARY_EXAMPLES = [
+    QAs(
+        question={
+            "minutes": "\n".join([
+                "Han Solo: Hey this is Alice.",
+                "Skywalker: Yo, I'm Bob. I like skateboarding.",
+                "VADER: hi im alice too??",
+                "Han Solo: wait there can't be two Alices",
+                "Skywalker: one of you is lying lol"
+            ]),
+            "game_summary": GameSummaryBM(
+                round_number=0,
+                players_alive=human_code_names + ai_code_names,
+                players_voted_off=[],
+                last_vote_outcome="N/A",
+                textual_summary="The game has just started. No events have occurred yet."
+            ).model_dump_json()
+        },
+        answer=GameSummaryBM(
+            round_number=0,
+            players_alive=human_code_names + ai_code_names,
+            players_voted_off=[],
+            last_vote_outcome="N/A",
+            textual_summary="Players introduced themselves. Skywalker is Bob and likes skateboarding. "
+                    "Han Solo and VADER both claimed to be Alice, and Skywalker thinks one of them is lying."
+        )
+    ),
+]
@@ -0,0 +1,55 @@
+from typing import List, Tuple
+
+from .prompter import estimate_text_tokens
+
+
+class MinutesWindow:
+    """
+    Bounds the minutes sent to the prompters as the game goes on.
+
+    Only the latest `keep_last` chat lines are sent verbatim, trimmed from the oldest end
+    until they fit `token_budget` estimated tokens. Lines that fall out of the window are
+    handed out in batches of at least `fold_batch` by `to_fold`, so the caller can fold them
+    into the rolling game summary, and marked done with `mark_folded`. Until then they are
+    still sent verbatim.
+    """
+    def __init__(self, keep_last: int, token_budget: int, fold_batch: int = 10):
+        self.keep_last = keep_last
+        self.token_budget = token_budget
+        self.fold_batch = fold_batch
+        self.folded = 0  # Lines from the start of the log already folded into the summary
+
+    def _start(self, minutes: List[str]) -> int:
+        """Index of the first line that is still sent verbatim."""
+        start = max(0, len(minutes) - self.keep_last) if self.keep_last else 0
+        if self.token_budget:
+            total = 0
+            for i in range(len(minutes) - 1, start - 1, -1):
+                total += estimate_text_tokens(minutes[i])
+                if total > self.token_budget:
+                    # Always keep the newest line, even if it alone is over budget
+                    return min(i + 1, len(minutes) - 1)
+        return start
+
+    def view(self, minutes: List[str]) -> List[str]:
+        """
+        The lines to send verbatim. Lines that left the window but are not in the summary yet
+        (still building up to a batch, or being folded) stay in it, so no line is ever in
+        neither.
+        """
+        if self.folded > len(minutes):
+            self.folded = 0  # The log was reset
+        return minutes[min(self.folded, self._start(minutes)):]
+
+    def to_fold(self, minutes: List[str]) -> Tuple[List[str], int]:
+        """
+        Returns the lines that left the window and are not in the summary yet, plus the index
+        to pass to mark_folded once they are. Empty until `fold_batch` lines have built up.
+        """
+        boundary = self._start(minutes)
+        if boundary - self.folded < self.fold_batch:
+            return [], self.folded
+        return minutes[self.folded:boundary], boundary
+
+    def mark_folded(self, upto: int) -> None:
+        self.folded = max(self.folded, upto)
@@ -0,0 +1,236 @@
+import asyncio
+from dataclasses import dataclass
+import json
+import random
+import threading
+from typing import Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+from . import enums_dcs
+from .backends import make_completion, sample_output
+from .prompter import compact_schema, estimate_tokens
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+@dataclass
+class MockProfile:
+    """
+    How the mock server behaves. Latencies are in seconds; a request's latency is drawn by
+    interpolating between the given percentiles (half of p50 at the fastest, twice p99 at
+    the slowest).
+    """
+    p50: float = 0.4
+    p95: float = 1.2
+    p99: float = 2.5
+    error_rate: float = 0.0        # Fraction of requests answered with a 500 after their latency
+    rate_limit_rate: float = 0.0   # Fraction of requests answered with an immediate 429
+    retry_after: float = 1.0       # Seconds sent in the 429's retry-after header
+    stream_chunk_chars: int = 8    # Characters of content per chunk when stream=True
+    stream_chunk_delay: float = 0.05  # Seconds between chunks when stream=True
+    seed: Optional[int] = None
+
+    def sample_latency(self, rng: random.Random) -> float:
+        points = ((0.0, self.p50 / 2), (0.5, self.p50), (0.95, self.p95), (0.99, self.p99), (1.0, self.p99 * 2))
+        u = rng.random()
+        for (q0, l0), (q1, l1) in zip(points, points[1:]):
+            if u <= q1:
+                return l0 + (l1 - l0) * (u - q0) / (q1 - q0)
+        return points[-1][1]
+
+
+def _output_formats() -> Dict[str, type]:
+    """compact_schema -> BaseModel, for every response model in enums_dcs (longest schema first)."""
+    models = [
+        obj for obj in vars(enums_dcs).values()
+        if isinstance(obj, type) and issubclass(obj, BaseModel) and obj.__module__ == enums_dcs.__name__
+    ]
+    schemas = {compact_schema(model): model for model in models}
+    return dict(sorted(schemas.items(), key=lambda item: len(item[0]), reverse=True))
+
+
+class MockCompletionServer:
+    """
+    A local server speaking the chat.completions wire format, for load tests that should
+    go through the real openai/httpx stack. Point a prompter at it with
+    OpenAIPrompter(base_url=server.base_url), or set OPENAI_BASE_URL.
+
+    Every prompter's few-shot examples carry its output schema, so the server recognizes
+    which enums_dcs model a request wants and answers with schema-valid JSON for it.
+    """
+    def __init__(self, profile: MockProfile = None, host: str = "127.0.0.1", port: int = 0):
+        self.profile = profile or MockProfile()
+        self.host = host
+        self.port = port
+        self.rng = random.Random(self.profile.seed)
+        self.stats = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "streamed": 0, "by_format": {}}
+        self._formats = _output_formats()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}  # Open keep-alive connections
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    async def start(self) -> "MockCompletionServer":
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            handlers = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*handlers, return_exceptions=True)
+            await self._server.wait_closed()
+
+    def start_in_thread(self) -> "MockCompletionServer":
+        """Runs the server on its own event loop in a daemon thread, for synchronous callers."""
+        started = threading.Event()
+
+        def serve():
+            loop = asyncio.new_event_loop()
+            loop.run_until_complete(self.start())
+            started.set()
+            loop.run_forever()
+
+        threading.Thread(target=serve, daemon=True).start()
+        started.wait()
+        return self
+
+    def stop_thread(self) -> None:
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self.close(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def output_format(self, messages: list) -> Optional[type]:
+        """Returns the enums_dcs model whose schema appears in the request, if any."""
+        for message in messages:
+            content = message.get("content") or ""
+            for schema, model in self._formats.items():
+                if schema in content:
+                    return model
+        return None
+
+    # === HTTP ===
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._route(method, path, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    def _write_head(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str]) -> None:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: dict,
+                         extra_headers: Dict[str, str] = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self._write_head(writer, status, {
+            "content-type": "application/json", "content-length": str(len(body)), **(extra_headers or {})
+        })
+        writer.write(body)
+        await writer.drain()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        if method != "POST" or not path.rstrip("/").endswith("/chat/completions"):
+            await self._send_json(writer, 404, {"error": {"message": f"No route for {method} {path}"}})
+            return
+        try:
+            request = json.loads(body)
+        except ValueError:
+            await self._send_json(writer, 400, {"error": {"message": "Request body is not JSON"}})
+            return
+        self.stats["requests"] += 1
+
+        if self.rng.random() < self.profile.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            await self._send_json(writer, 429, {"error": {
+                "message": "Rate limit reached for requests", "type": "requests", "code": "rate_limit_exceeded"
+            }}, {"retry-after": str(self.profile.retry_after)})
+            return
+
+        await asyncio.sleep(self.profile.sample_latency(self.rng))
+        if self.rng.random() < self.profile.error_rate:
+            self.stats["errors"] += 1
+            await self._send_json(writer, 500, {"error": {
+                "message": "The server had an error while processing your request.", "type": "server_error"
+            }})
+            return
+
+        content, format_name = self._content(request.get("messages", []))
+        self.stats["by_format"][format_name] = self.stats["by_format"].get(format_name, 0) + 1
+        completion = make_completion(
+            content, request.get("model", "mock"), estimate_tokens(request.get("messages", [])))
+        if request.get("stream"):
+            self.stats["streamed"] += 1
+            await self._stream(writer, completion.model_dump(mode="json"), content)
+        else:
+            await self._send_json(writer, 200, completion.model_dump(mode="json"))
+        self.stats["ok"] += 1
+
+    def _content(self, messages: list) -> Tuple[str, str]:
+        """Returns the JSON reply body and the name of the model it was built for."""
+        output_format = self.output_format(messages)
+        if output_format is not None:
+            return json.dumps(sample_output(output_format, self.rng)), output_format.__name__
+        # Unknown prompt: echo its last example answer, which is valid for it by construction
+        for message in reversed(messages):
+            if message.get("role") == "assistant":
+                return message["content"], "example"
+        return "{}", "unknown"
+
+    async def _stream(self, writer: asyncio.StreamWriter, completion: dict, content: str) -> None:
+        """Sends the completion as server-sent chat.completion.chunk events, chunked and slowed down."""
+        self._write_head(writer, 200, {"content-type": "text/event-stream", "transfer-encoding": "chunked"})
+        size = max(1, self.profile.stream_chunk_chars)
+        pieces = [content[i:i + size] for i in range(0, len(content), size)]
+        for i, piece in enumerate(pieces + [None]):
+            chunk = {
+                "id": completion["id"], "object": "chat.completion.chunk",
+                "created": completion["created"], "model": completion["model"],
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": piece} if piece is not None else {},
+                    "finish_reason": None if piece is not None else "stop"
+                }]
+            }
+            if i == 0:
+                chunk["choices"][0]["delta"]["role"] = "assistant"
+            self._write_chunk(writer, f"data: {json.dumps(chunk)}\n\n")
+            await writer.drain()
+            if piece is not None:
+                await asyncio.sleep(self.profile.stream_chunk_delay)
+        self._write_chunk(writer, "data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, text: str) -> None:
+        data = text.encode("utf-8")
+        writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
@@ -4,18 +4,191 @@ Author: Dan Schumacher
 How to run:
    python ./src/utils/prompter.py
 '''
+import asyncio
+import hashlib
 import os
 import json
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
-from typing import List, Union, Dict
+from typing import Callable, Iterable, List, Optional, Tuple, Union, Dict
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
-import openai
+from openai.types.chat import ChatCompletion
+from .clients import ClientRegistry
+from .response_cache import cache_key, get_response_cache
+from .resilience import CompletionPolicy
+from .rate_limiter import Tenant, get_rate_limiter
+from .backends import (
+    Cassette, CompletionBackend, OpenAIBackend, RecordingBackend, ReplayBackend, StubBackend
+)
+from utils.constants import (
+    LLM_BACKEND, LLM_CASSETTE_PATH, LLM_REPLAY_LATENCY_SCALE, LLM_STUB_LATENCY,
+    COMPLETION_DEADLINE, COMPLETION_MAX_RETRIES, RATE_LIMIT_COMPLETION_ESTIMATE
+)
 
 class QAs(BaseModel):
     question: Dict[str, str]  # Multiple inputs as a dictionary
     answer: str | BaseModel  # Allow both strings and BaseModel
 
+# === Example Packs ===
+class FrozenMessage(dict):
+    """A chat message dict that cannot be changed in place; copies are plain dicts."""
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Example pack messages are shared by every prompter and cannot be modified")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = __ior__ = _readonly
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> dict:
+        return dict(self)
+
+    def __reduce__(self):
+        return (FrozenMessage, (dict(self),))
+
+@dataclass(frozen=True)
+class ExamplePack:
+    """
+    Few-shot examples rendered once into user/assistant message blocks.
+    Built by compile_example_pack and shared read-only by every prompter that uses them.
+    """
+    prompt_headers: Tuple[Tuple[str, str], ...]
+    output_format: type
+    main_prompt_header: str
+    messages: Tuple[FrozenMessage, ...]  # Alternating user/assistant messages
+
+    def __len__(self) -> int:
+        return len(self.messages) // 2
+
+@lru_cache(maxsize=None)
+def model_schema(output_format) -> dict:
+    """Returns output_format.model_json_schema(), generated once per model. Do not mutate it."""
+    return output_format.model_json_schema()
+
+@lru_cache(maxsize=None)
+def compact_schema(output_format) -> str:
+    """Returns the model's JSON schema as minified JSON, rendered once per model."""
+    return json.dumps(model_schema(output_format), separators=(",", ":"))
+
+def render_question(question_dict: Dict[str, str], prompt_headers: Dict[str, str], output_format) -> str:
+    """Formats multiple question fields for the LLM, followed by the JSON output instructions"""
+    formatted_questions = "\n\n".join(
+        f"{prompt_headers.get(key, key).upper()}: {value}" for key, value in question_dict.items()
+    )
+    return (
+        f"{formatted_questions}\n"
+        f"Provide your response **only** in JSON format as shown below:\n"
+        f"{compact_schema(output_format)}\n"
+        f"Do not include any extra text, explanations, or comments outside the JSON object."
+    )
+
+def format_user_message(fields: Dict[str, str], prompt_headers: Dict[str, str], main_prompt_header: str) -> dict:
+    """Formats a dict of fields into one user message under the main prompt header."""
+    lines = []
+    for key, value in fields.items():
+        if isinstance(value, dict):  #  Ensure only dictionaries are unpacked
+            formatted_value = "\n".join(f"{sub_key}: {sub_value}" for sub_key, sub_value in value.items())
+        elif isinstance(value, str):  #  Keep JSON strings as-is
+            formatted_value = value
+        else:
+            formatted_value = str(value)  # Convert unknown types to string
+
+        lines.append(f"{prompt_headers.get(key, key)}: {formatted_value}")
+
+    text = "\n".join(lines)
+    return {"role": "user", "content": f"{main_prompt_header}\n{text}"}
+
+def estimate_text_tokens(text: str) -> int:
+    """Rough token count for a piece of text (~4 characters per token)."""
+    return len(text) // 4 + 1
+
+def estimate_tokens(messages: List[dict]) -> int:
+    """Rough prompt token count for a messages list, plus per-message overhead."""
+    return sum(estimate_text_tokens(m["content"]) + 3 for m in messages)
+
+_example_packs: Dict[tuple, Tuple[List[QAs], ExamplePack]] = {}
+
+def compile_example_pack(
+        examples: List[QAs], prompt_headers: Dict[str, str], output_format,
+        main_prompt_header: str) -> ExamplePack:
+    """
+    Renders a list of QAs into an ExamplePack without modifying the QAs. Each distinct
+    (examples, headers, output format, main header) combination is compiled once per process.
+    """
+    key = (id(examples), tuple(prompt_headers.items()), output_format, main_prompt_header)
+    cached = _example_packs.get(key)
+    if cached is not None and cached[0] is examples:
+        return cached[1]
+
+    messages = []
+    for qa in examples:
+        question = {
+            key: render_question({key: value}, prompt_headers, output_format) if isinstance(value, str) else value  #  Preserve dict structure
+            for key, value in qa.question.items()
+        }
+        answer = qa.answer.model_dump_json() if isinstance(qa.answer, BaseModel) else qa.answer
+        messages.append(format_user_message(question, prompt_headers, main_prompt_header))
+        messages.append({"role": "assistant", "content": answer})
+
+    pack = ExamplePack(
+        prompt_headers=tuple(prompt_headers.items()),
+        output_format=output_format,
+        main_prompt_header=main_prompt_header,
+        messages=tuple(FrozenMessage(m) for m in messages)
+    )
+    _example_packs[key] = (examples, pack)  # Holding `examples` keeps its id from being reused
+    return pack
+
+# === Lazy Prompter Registry ===
+class LazyPrompterRegistry(Mapping):
+    """
+    Read-only mapping of name -> prompter that builds each prompter on first lookup
+    and memoizes it. `warm` prebuilds chosen prompters in a background thread.
+    """
+    def __init__(self, factories: Dict[str, Callable[[], "Prompter"]]):
+        self._factories = dict(factories)
+        self._built: Dict[str, "Prompter"] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> "Prompter":
+        prompter = self._built.get(name)
+        if prompter is not None:
+            return prompter
+        if name not in self._factories:
+            raise KeyError(name)
+        with self._lock:
+            if name not in self._built:
+                self._built[name] = self._factories[name]()
+            return self._built[name]
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    @property
+    def built(self) -> List[str]:
+        """Names of the prompters constructed so far."""
+        return list(self._built)
+
+    def warm(self, names: Iterable[str] = None) -> threading.Thread:
+        """Builds the named prompters (default: all) in a daemon thread and returns it."""
+        names = list(self._factories if names is None else names)
+
+        def build_all():
+            for name in names:
+                self[name]
+
+        thread = threading.Thread(target=build_all, name="prompter-warmup", daemon=True)
+        thread.start()
+        return thread
+
 # === Base Prompter Class ===
 class Prompter(ABC):
     def __init__(
@@ -25,14 +198,14 @@ class Prompter(ABC):
         """
         :param openai_dict_key: API key variable name in .env
         :param system_prompt: System message for the LLM
-        :param examples: Few-shot examples (now supports multiple inputs)
+        :param examples: Few-shot examples (now supports multiple inputs), or a precompiled ExamplePack
         :param prompt_headers: Dictionary mapping field names to headers
         :param output_format: Expected output format (Pydantic model)
         """
         self.api_env_key = openai_dict_key
         self.llm_model = llm_model
         self.system_prompt = system_prompt
-        self.examples = examples  # Keep as list of QAs
+        self.examples = examples  # List of QAs or ExamplePack, never modified
         self.main_prompt_header = main_prompt_header
         self.prompt_headers = prompt_headers  # Multiple headers for different input fields
         self.output_format = output_format
@@ -46,9 +219,15 @@ class Prompter(ABC):
     def __repr__(self) -> str:
         return f"Prompter(model={self.llm_model}, examples={len(self.examples)})"
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _load_dotenv_once() -> None:
+        """Reads ./resources/.env once per process instead of once per prompter"""
+        load_dotenv("./resources/.env")
+
     def _load_env(self) -> str:
         """Loads API key from .env"""
-        load_dotenv("./resources/.env")
+        self._load_dotenv_once()
         api_key = os.getenv(self.api_env_key)
         if not api_key:
             raise ValueError(f"API Key not found. Set {self.api_env_key}=xxxx in ./resources/.env")
@@ -56,25 +235,22 @@ class Prompter(ABC):
 
     def format_q_as_string(self, question_dict: Dict[str, str]) -> str:
         """Formats multiple question fields for the LLM"""
-        formatted_questions = "\n\n".join(
-            f"{self.prompt_headers.get(key, key).upper()}: {value}" for key, value in question_dict.items()
-        )
-        return (
-            f"{formatted_questions}\n"
-            f"Provide your response **only** in JSON format as shown below:\n"
-            f"{self.output_format.model_json_schema()}\n"
-            f"Do not include any extra text, explanations, or comments outside the JSON object."
-        )
+        return render_question(question_dict, self.prompt_headers, self.output_format)
 
     def format_examples(self):
-        """Formats few-shot examples by prepending prompt headers"""
-        for qa in self.examples:
-            qa.question = {
-                key: self.format_q_as_string({key: value}) if isinstance(value, str) else value  #  Preserve dict structure
-                for key, value in qa.question.items()
-            }
-            if isinstance(qa.answer, BaseModel):
-                qa.answer = qa.answer.model_dump_json()
+        """Resolves the rendered few-shot blocks, compiling them on first use in the process"""
+        if isinstance(self.examples, ExamplePack):
+            pack = self.examples
+            if (pack.output_format is not self.output_format
+                    or dict(pack.prompt_headers) != self.prompt_headers
+                    or pack.main_prompt_header != self.main_prompt_header):
+                raise ValueError(
+                    f"Example pack for {pack.output_format.__name__} was compiled with different "
+                    f"headers or output format than this prompter ({self.output_format.__name__})")
+            self.example_pack = pack
+        else:
+            self.example_pack = compile_example_pack(
+                self.examples, self.prompt_headers, self.output_format, self.main_prompt_header)
 
 
     @abstractmethod
@@ -87,65 +263,257 @@ class Prompter(ABC):
         """Send the prompt to the LLM and get a response"""
         pass
 
+# Completion backends, and the ones that call the API (and so need a key and the rate limiter)
+BACKENDS = ("openai", "record", "replay", "stub")
+ONLINE_BACKENDS = ("openai", "record")
+
+def check_backend_config(backend: str, openai_dict_key: str = "OPENAI_API_KEY") -> None:
+    """
+    Raises ValueError for an unknown backend, or a missing API key when the backend calls
+    the API. Cheap, so callers that build their prompters lazily can still fail at startup.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}. Use 'openai', 'record', 'replay' or 'stub'.")
+    if backend in ONLINE_BACKENDS:
+        Prompter._load_dotenv_once()
+        if not os.getenv(openai_dict_key):
+            raise ValueError(f"API Key not found. Set {openai_dict_key}=xxxx in ./resources/.env")
+
+# Replaces the minutes header on session turns after the first
+SESSION_MINUTES_HEADER = "New messages since your last answer\nMINUTES:\n"
+
 # === OpenAI Implementation ===
 class OpenAIPrompter(Prompter):
-    def __init__(self, llm_model="gpt-4o-mini", **kwargs):
+    def __init__(
+            self, llm_model="gpt-4o-mini", base_url: str = None, session: bool = False,
+            session_max_turns: int = 20, cache: bool = False, backend: str = LLM_BACKEND,
+            deadline: float = COMPLETION_DEADLINE, max_retries: int = COMPLETION_MAX_RETRIES,
+            hedge: bool = False, rate_limit_priority: int = 0, rate_limit_tenant: Tenant = ("", ""),
+            **kwargs):
+        """
+        :param session: Keep one growing conversation instead of resending the full minutes.
+            Each call replays the earlier turns byte for byte and appends a user message with
+            only the minutes added since the last call, so the provider's prompt-prefix cache
+            covers everything but the newest turn. Only applies when `minutes` is a list that
+            extends the one sent last time; anything else starts a new session.
+        :param session_max_turns: Turns kept before the session starts over, bounding its size.
+        :param cache: Serve identical requests from the shared ResponseCache instead of the API.
+        :param backend: "openai" calls the API, "record" also appends every exchange to the
+            cassette at LLM_CASSETTE_PATH, "replay" serves the cassette back offline and "stub"
+            returns deterministic schema-valid JSON. "replay" and "stub" need no API key.
+        :param deadline: Seconds a completion may take in total, retries included.
+        :param max_retries: Retries after retryable errors (timeouts, 429s, 5xx), with
+            jittered exponential backoff.
+        :param hedge: In aget_completion, send a duplicate request once the first outlives this
+            prompter's p95 latency and use whichever answers first. Costs extra tokens.
+        :param rate_limit_priority: Queue priority in the shared RateLimiter (lower goes first).
+            Requests to the API ("openai" and "record") wait for the limiter; offline ones don't.
+        :param rate_limit_tenant: (lobby, AI code name) the requests are for, so the limiter can
+            share capacity fairly between lobbies and AIs.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}. Use 'openai', 'record', 'replay' or 'stub'.")
+        self.backend_mode = backend
         super().__init__(**kwargs)
-        self.client = openai.Client(api_key=self._load_env())
+        self.base_url = base_url
+        # Shared with every other prompter using the same key and endpoint
+        self.client = ClientRegistry.get_instance().get_client(self._load_env(), base_url)
+        # Token accounting from response.usage; the "cancelled_*" tokens are estimated
+        self.usage_stats = {
+            "requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+            "cancelled": 0, "cancelled_wasted_tokens": 0, "cancelled_saved_tokens": 0,
+            "response_cache_hits": 0
+        }
+        self.response_cache = get_response_cache() if cache else None
+        self.session = session
+        self.session_max_turns = session_max_turns
+        self._session_turns: List[dict] = []     # Earlier user/assistant turns, replayed as-is
+        self._session_minutes: List[str] = []    # Minutes those turns already contain
+        self._session_headers = {**self.prompt_headers, "minutes": SESSION_MINUTES_HEADER}
+        # Cassette entries are matched by output format and instructions when prompts differ
+        header_digest = hashlib.md5(self.main_prompt_header.encode("utf-8")).hexdigest()[:8]
+        self._route = f"{self.output_format.__name__}:{header_digest}"
+        self.backend = self._make_backend()
+        self.policy = CompletionPolicy(deadline, max_retries, hedge)
+        self.rate_limiter = get_rate_limiter() if backend in ONLINE_BACKENDS else None
+        self.rate_limit_priority = rate_limit_priority
+        self.rate_limit_tenant = rate_limit_tenant
+        self._compile_prefix()
+
+    def _load_env(self) -> str:
+        """Loads API key from .env (not required by the offline backends)"""
+        if self.backend_mode not in ONLINE_BACKENDS:
+            self._load_dotenv_once()
+            return os.getenv(self.api_env_key) or "offline"
+        return super()._load_env()
+
+    def _make_backend(self) -> CompletionBackend:
+        if self.backend_mode == "stub":
+            return StubBackend(self.output_format, latency=LLM_STUB_LATENCY)
+        if self.backend_mode == "replay":
+            return ReplayBackend(Cassette.get_instance(LLM_CASSETTE_PATH), LLM_REPLAY_LATENCY_SCALE)
+        backend = OpenAIBackend(self.client, getattr(self, "async_client", None))
+        if self.backend_mode == "record":
+            backend = RecordingBackend(backend, Cassette.get_instance(LLM_CASSETTE_PATH))
+        return backend
 
     def parse_output(self, llm_output) -> list:
         """Extracts the response text from the OpenAI API response"""
         return json.loads(llm_output.choices[0].message.content)
 
+    def _format_user_message(self, fields: Dict[str, str]) -> dict:
+        """Formats a dict of fields into one user message under the main prompt header."""
+        return format_user_message(fields, self.prompt_headers, self.main_prompt_header)
+
+    def _compile_prefix(self) -> tuple:
+        """
+        Builds the static part of every request (system prompt + few-shot examples)
+        once. Call again if system_prompt or examples change.
+        """
+        system = {"role": "system", "content": self.system_prompt}
+        self._prefix_messages = (system, *self.example_pack.messages)
+        return self._prefix_messages
+
     def _build_messages(self, input_texts: Dict[str, str]):
         """Builds the messages list for the OpenAI API with a single structured user message."""
-        messages = [{"role": "system", "content": self.system_prompt}]
-        
-        # Add example QAs (Few-shot learning)
-        for qa in self.examples:
-            example_lines = []
-            for key, value in qa.question.items():
-                if isinstance(value, dict):  #  Ensure only dictionaries are unpacked
-                    formatted_value = "\n".join(f"{sub_key}: {sub_value}" for sub_key, sub_value in value.items())
-                elif isinstance(value, str):  #  Keep JSON strings as-is
-                    formatted_value = value
-                else:
-                    formatted_value = str(value)  # Convert unknown types to string
-
-                example_lines.append(f"{self.prompt_headers.get(key, key)}: {formatted_value}")
-
-            example_text = "\n".join(example_lines)
-            messages.append({"role": "user", "content": f"{self.main_prompt_header}\n{example_text}"})
-            messages.append({"role": "assistant", "content": qa.answer})
-
-        # Format user input into a single message
-        user_input_lines = []
-        for key, value in input_texts.items():
-            if isinstance(value, dict):
-                formatted_value = "\n".join(f"{sub_key}: {sub_value}" for sub_key, sub_value in value.items())
-            elif isinstance(value, str):
-                formatted_value = value
-            else:
-                formatted_value = str(value)
-
-            user_input_lines.append(f"{self.prompt_headers.get(key, key)}: {formatted_value}")
-
-        user_input_text = "\n".join(user_input_lines)
-        messages.append({"role": "user", "content": f"{self.main_prompt_header}\n{user_input_text}"})
-
-        return messages
+        # Only the live inputs are formatted per call; the prefix was rendered at construction
+        return [*self._prefix_messages, self._format_user_message(input_texts)]
 
-    def get_completion(
-            self, input_texts: Dict[str, str], parse=True, verbose=False) -> Union[dict, None]:
-        """Calls OpenAI API with multiple formatted inputs"""
-        input_text_str = self._build_messages(input_texts)
-        response = self.client.chat.completions.create(
-            model=self.llm_model,
-            messages=input_text_str,
-            temperature=self.temperature,
-            response_format={"type": "json_object"}
-        )
+    def _prepare(self, input_texts: Dict[str, str]) -> Tuple[List[dict], Optional[tuple]]:
+        """
+        Returns the messages to send and, in session mode, the turn to commit once the
+        response arrives (None otherwise).
+        """
+        minutes = input_texts.get("minutes")
+        if not self.session or not isinstance(minutes, list):
+            return self._build_messages(input_texts), None
+
+        sent = len(self._session_minutes)
+        if (not self._session_turns or len(self._session_turns) >= 2 * self.session_max_turns
+                or minutes[:sent] != self._session_minutes):
+            # First call, session full, or the minutes no longer extend what was sent
+            self._session_turns, self._session_minutes, sent = [], [], 0
+            user = self._format_user_message(input_texts)
+        else:
+            user = format_user_message(
+                {**input_texts, "minutes": minutes[sent:]},
+                self._session_headers, self.main_prompt_header
+            )
+        messages = [*self._prefix_messages, *self._session_turns, user]
+        return messages, (user, list(minutes), len(self._session_turns))
+
+    def _commit_turn(self, turn: Optional[tuple], response) -> None:
+        """Adds a finished session turn so the next call replays it unchanged."""
+        if turn is None:
+            return
+        user, minutes, turns_before = turn
+        if len(self._session_turns) != turns_before:
+            return  # Another call moved the session on meanwhile
+        content = response.choices[0].message.content
+        self._session_turns += [user, {"role": "assistant", "content": content}]
+        self._session_minutes = minutes
+
+    def reset_session(self) -> None:
+        self._session_turns, self._session_minutes = [], []
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Share of prompt tokens the provider served from its prompt cache."""
+        prompt_tokens = self.usage_stats["prompt_tokens"]
+        return self.usage_stats["cached_tokens"] / prompt_tokens if prompt_tokens else 0.0
+
+    def estimate_prompt_tokens(self, input_texts: Dict[str, str]) -> int:
+        """Estimated prompt tokens for a request with these inputs, without sending it."""
+        return estimate_tokens(self._build_messages(input_texts))
+
+    def _record_usage(self, response) -> None:
+        usage = getattr(response, "usage", None)
+        self.usage_stats["requests"] += 1
+        if usage is not None:
+            self.usage_stats["prompt_tokens"] += usage.prompt_tokens or 0
+            self.usage_stats["completion_tokens"] += usage.completion_tokens or 0
+            details = getattr(usage, "prompt_tokens_details", None)
+            self.usage_stats["cached_tokens"] += getattr(details, "cached_tokens", None) or 0
+
+    def _record_cancelled(self, messages: List[dict], sent: bool) -> None:
+        """
+        Counts a request abandoned before its response arrived. Once sent, its prompt is billed
+        anyway (wasted) and only the completion is saved, estimated as this prompter's average
+        so far; a request cancelled before it was sent saves its prompt too.
+        """
+        prompt = estimate_tokens(messages)
+        self.usage_stats["cancelled"] += 1
+        self.usage_stats["cancelled_wasted_tokens"] += prompt if sent else 0
+        self.usage_stats["cancelled_saved_tokens"] += self.mean_completion_tokens() + (0 if sent else prompt)
+
+    def mean_completion_tokens(self) -> int:
+        """Average completion so far, or RATE_LIMIT_COMPLETION_ESTIMATE before any usage."""
+        requests = self.usage_stats["requests"]
+        return self.usage_stats["completion_tokens"] // requests if requests else RATE_LIMIT_COMPLETION_ESTIMATE
+
+    def mean_prompt_tokens(self) -> int:
+        """Average prompt so far, or 0 before any usage."""
+        requests = self.usage_stats["requests"]
+        return self.usage_stats["prompt_tokens"] // requests if requests else 0
+
+    def _request(self, messages: List[dict]) -> dict:
+        """Arguments for chat.completions.create."""
+        return {
+            "model": self.llm_model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "response_format": {"type": "json_object"}
+        }
 
+    def _expected_tokens(self, messages: List[dict]) -> int:
+        """Prompt estimate plus this prompter's average completion, for the rate limiter."""
+        return estimate_tokens(messages) + self.mean_completion_tokens()
+
+    def _settle(self, estimated: int, response) -> None:
+        usage = getattr(response, "usage", None)
+        self.rate_limiter.settle(estimated, getattr(usage, "total_tokens", None) or estimated)
+
+    def _rate_limited(self, request: dict) -> Tuple[int, Optional[Callable], Optional[Callable]]:
+        """
+        The request's token estimate and the blocking and awaitable waits for the rate limiter,
+        which the policy runs before each request (None when the limiter is off).
+        """
+        if self.rate_limiter is None:
+            return 0, None, None
+        estimated = self._expected_tokens(request["messages"])
+        args = (estimated, self.rate_limit_priority, self.rate_limit_tenant)
+        return (estimated,
+                lambda timeout: self.rate_limiter.acquire(*args, timeout),
+                lambda: self.rate_limiter.aacquire(*args))
+
+    def _send(self, request: dict, estimated: int, timeout: float) -> ChatCompletion:
+        """One request to the backend, once the rate limiter (when on) let it through."""
+        response = self.backend.create(request, self._route, timeout)
+        if self.rate_limiter is not None:
+            self._settle(estimated, response)
+        return response
+
+    def _cache_lookup(self, request: dict) -> Tuple[Optional[str], Optional[ChatCompletion]]:
+        """Returns the request's cache key and the cached response, if caching is on and it hit."""
+        if self.response_cache is None:
+            return None, None
+        key = cache_key(
+            request["model"], request["temperature"], request["messages"], request["response_format"])
+        request_bytes = sum(len(m["content"]) for m in request["messages"])
+        body = self.response_cache.get(key, request_bytes=request_bytes)
+        if body is None:
+            return key, None
+        self.usage_stats["response_cache_hits"] += 1
+        return key, ChatCompletion.model_validate_json(body)
+
+    def _cache_store(self, key: Optional[str], response) -> None:
+        if key is not None:
+            self.response_cache.put(key, response.model_dump_json())
+
+    def _finish(self, response, parse: bool, verbose: bool, cached: bool = False) -> Union[dict, None]:
+        """Parses (and optionally prints) a raw API response"""
+        if not cached:
+            self._record_usage(response)
         final_resp = self.parse_output(response) if parse else response
 
         if verbose:
@@ -156,3 +524,65 @@ class OpenAIPrompter(Prompter):
 
         return final_resp
 
+    def get_completion(
+            self, input_texts: Dict[str, str], parse=True, verbose=False) -> Union[dict, None]:
+        """Calls OpenAI API with multiple formatted inputs"""
+        input_text_str, turn = self._prepare(input_texts)
+        request = self._request(input_text_str)
+        key, response = self._cache_lookup(request)
+        cached = response is not None
+        if not cached:
+            estimated, acquire, _ = self._rate_limited(request)
+            response = self.policy.call(lambda timeout: self._send(request, estimated, timeout), acquire)
+            self._cache_store(key, response)
+        self._commit_turn(turn, response)
+        return self._finish(response, parse, verbose, cached)
+
+# === Async OpenAI Implementation ===
+class AsyncOpenAIPrompter(OpenAIPrompter):
+    """
+    OpenAIPrompter with an awaitable `aget_completion`, so a completion in flight
+    does not block the event loop. `get_completion` still works synchronously.
+    """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.async_client = ClientRegistry.get_instance().get_async_client(
+            self._load_env(), self.base_url)
+        self.backend = self._make_backend()  # Again, now that the async client exists
+
+    async def _asend(self, request: dict, estimated: int) -> ChatCompletion:
+        """Awaitable version of _send."""
+        response = await self.backend.acreate(request, self._route)
+        if self.rate_limiter is not None:
+            self._settle(estimated, response)
+        return response
+
+    async def aget_completion(
+            self, input_texts: Dict[str, str], parse=True, verbose=False) -> Union[dict, None]:
+        """Awaitable version of get_completion. Cancelling the caller aborts the HTTP request."""
+        input_text_str, turn = self._prepare(input_texts)
+        request = self._request(input_text_str)
+        key, response = None, None
+        if self.response_cache is not None:
+            # The cache may hit SQLite, so it runs off the event loop
+            key, response = await asyncio.to_thread(self._cache_lookup, request)
+        cached = response is not None
+        if not cached:
+            sent = False  # Whether any attempt got past the rate limiter to the backend
+
+            def attempt():
+                nonlocal sent
+                sent = True
+                return self._asend(request, estimated)
+
+            try:
+                estimated, _, aacquire = self._rate_limited(request)
+                response = await self.policy.acall(attempt, aacquire)
+            except asyncio.CancelledError:
+                self._record_cancelled(input_text_str, sent)
+                raise
+            if key is not None:
+                await asyncio.to_thread(self._cache_store, key, response)
+        self._commit_turn(turn, response)
+        return self._finish(response, parse, verbose, cached)
+
@@ -0,0 +1,221 @@
+import asyncio
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .resilience import LatencyTracker
+from utils.constants import RATE_LIMIT_AGING, RATE_LIMIT_RPM, RATE_LIMIT_SHARE_HALF_LIFE, RATE_LIMIT_TPM
+
+Tenant = Tuple[str, str]  # (lobby, AI code name)
+
+
+class _Waiter:
+    __slots__ = ("tokens", "priority", "tenant", "seq", "enqueued_at", "wake")
+
+    def __init__(self, tokens: int, priority: int, tenant: Tenant, seq: int, wake):
+        self.tokens = tokens
+        self.priority = priority
+        self.tenant = tenant
+        self.seq = seq
+        self.enqueued_at = time.monotonic()
+        self.wake = wake  # Called (from any thread) when the queue changed
+
+
+class RateLimiter:
+    """
+    Process-wide token buckets for the requests-per-minute and tokens-per-minute budgets,
+    with a queue in front of them.
+
+    Each request states its estimated tokens, a priority (lower goes first) and a tenant,
+    the (lobby, AI) it is for. Only the head of the queue may take from the buckets. The head
+    is picked from the best priority waiting, where a request's priority improves by one for
+    every `aging` seconds it has waited, so background work is delayed but never starved.
+    Within a priority, it is picked from the lobby that has been served the fewest tokens
+    lately, then the AI within that lobby that has, so one chatty AI or lobby cannot starve
+    the rest. Served tokens decay with a half-life of `share_half_life` seconds, and tenants
+    whose share has decayed away are forgotten. Works from threads (`acquire`) and event
+    loops (`aacquire`).
+
+    Once a response arrives, `settle` corrects the token bucket by the actual usage.
+    """
+    PRUNE_EVERY = 100  # Grants between sweeps of decayed tenants
+
+    def __init__(
+            self, rpm: int = RATE_LIMIT_RPM, tpm: int = RATE_LIMIT_TPM,
+            aging: float = RATE_LIMIT_AGING, share_half_life: float = RATE_LIMIT_SHARE_HALF_LIFE):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.aging = aging
+        self.share_half_life = share_half_life
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._refilled_at = time.monotonic()
+        self._waiters: List[_Waiter] = []
+        # (lobby,) and (lobby, AI) -> (decayed tokens granted, monotonic time of that value)
+        self._served: Dict[Tuple[str, ...], Tuple[float, float]] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.wait_times = LatencyTracker()
+        self.stats = {"granted": 0, "queued": 0, "max_queue_depth": 0, "settled_tokens": 0}
+
+    # === Buckets ===
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _shortfall(self, tokens: int) -> float:
+        """Seconds until both buckets can cover a request of `tokens`."""
+        request_wait = max(0.0, 1 - self._requests) * 60 / self.rpm
+        token_wait = max(0.0, tokens - self._tokens) * 60 / self.tpm
+        return max(request_wait, token_wait)
+
+    # === Fair share ===
+    def _share(self, key: Tuple[str, ...], now: float) -> float:
+        """Tokens granted to a lobby or AI, decayed to `now`."""
+        tokens, at = self._served.get(key, (0.0, now))
+        return tokens * 0.5 ** ((now - at) / self.share_half_life)
+
+    def _charge(self, tenant: Tenant, tokens: int, now: float) -> None:
+        for key in (tenant[:1], tenant):
+            self._served[key] = (self._share(key, now) + tokens, now)
+        if self.stats["granted"] % self.PRUNE_EVERY == 0:
+            self._served = {key: entry for key, entry in self._served.items() if self._share(key, now) >= 1}
+
+    # === Queue ===
+    def _priority(self, waiter: _Waiter, now: float) -> int:
+        return waiter.priority - int((now - waiter.enqueued_at) / self.aging)
+
+    def _head(self) -> Optional[_Waiter]:
+        if not self._waiters:
+            return None
+        now = time.monotonic()
+        return min(self._waiters, key=lambda w: (
+            self._priority(w, now), self._share(w.tenant[:1], now), self._share(w.tenant, now), w.seq))
+
+    def _enqueue(self, tokens: int, priority: int, tenant: Tenant, wake) -> _Waiter:
+        # A request larger than the whole budget would never fit; let it drain the bucket instead
+        waiter = _Waiter(min(tokens, self.tpm), priority, tenant, next(self._seq), wake)
+        with self._lock:
+            self._waiters.append(waiter)
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._waiters))
+        return waiter
+
+    def _try_take(self, waiter: _Waiter) -> Optional[float]:
+        """Grants the waiter if it is the head and the buckets allow. Returns 0 when granted,
+        otherwise how long to sleep (until it ages another step, unless woken first)."""
+        with self._lock:
+            now = time.monotonic()
+            if self._head() is not waiter:
+                return self.aging - (now - waiter.enqueued_at) % self.aging
+            self._refill(now)
+            wait = self._shortfall(waiter.tokens)
+            if wait > 0:
+                return wait
+            self._requests -= 1
+            self._tokens -= waiter.tokens
+            self._waiters.remove(waiter)
+            self.stats["granted"] += 1
+            self._charge(waiter.tenant, waiter.tokens, now)
+            if now - waiter.enqueued_at > 0.001:
+                self.stats["queued"] += 1
+            self.wait_times.record(now - waiter.enqueued_at)
+            head = self._head()
+        if head is not None:
+            head.wake()
+        return 0.0
+
+    def _leave(self, waiter: _Waiter) -> None:
+        """Drops a waiter that gave up (timeout or cancellation) and wakes the next head."""
+        with self._lock:
+            if waiter not in self._waiters:
+                return
+            self._waiters.remove(waiter)
+            head = self._head()
+        if head is not None:
+            head.wake()
+
+    def acquire(self, tokens: int, priority: int = 0, tenant: Tenant = ("", ""),
+                timeout: Optional[float] = None) -> None:
+        """Blocks until the request may be sent. Raises TimeoutError after `timeout` seconds."""
+        event = threading.Event()
+        waiter = self._enqueue(tokens, priority, tenant, event.set)
+        give_up_at = None if timeout is None else time.monotonic() + timeout
+        try:
+            while True:
+                wait = self._try_take(waiter)
+                if wait == 0:
+                    return
+                if give_up_at is not None:
+                    remaining = give_up_at - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Waited {timeout}s for the rate limiter")
+                    wait = min(wait, remaining)
+                event.wait(wait)
+                event.clear()
+        finally:
+            self._leave(waiter)
+
+    async def aacquire(self, tokens: int, priority: int = 0, tenant: Tenant = ("", "")) -> None:
+        """Waits until the request may be sent. Cancel the caller to give up."""
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = self._enqueue(tokens, priority, tenant, lambda: loop.call_soon_threadsafe(event.set))
+        try:
+            while True:
+                wait = self._try_take(waiter)
+                if wait == 0:
+                    return
+                try:
+                    await asyncio.wait_for(event.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+        finally:
+            self._leave(waiter)
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Corrects the token bucket once a response reports its real usage."""
+        with self._lock:
+            self._tokens = min(self.tpm, self._tokens + min(estimated, self.tpm) - actual)
+            self.stats["settled_tokens"] += actual - estimated
+            head = self._head()
+        if head is not None:
+            head.wake()
+
+    # === Metrics ===
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def report(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            by_priority: Dict[int, int] = {}
+            for waiter in self._waiters:
+                by_priority[waiter.priority] = by_priority.get(waiter.priority, 0) + 1
+            available = {"requests": int(self._requests), "tokens": int(self._tokens)}
+        wait = self.wait_times.report()
+        return {
+            **self.stats,
+            "queue_depth": sum(by_priority.values()),
+            "queue_by_priority": by_priority,
+            "available": available,
+            "wait_p50_ms": wait["p50_ms"],
+            "wait_p95_ms": wait["p95_ms"],
+            "wait_max_ms": wait["max_ms"],
+        }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide rate limiter, creating it on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
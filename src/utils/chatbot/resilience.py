@@ -0,0 +1,211 @@
+import asyncio
+from collections import deque
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+from utils.constants import (
+    COMPLETION_DEADLINE, COMPLETION_MAX_RETRIES, COMPLETION_BACKOFF_BASE, COMPLETION_BACKOFF_CAP,
+    HEDGE_MIN_SAMPLES, HEDGE_PERCENTILE
+)
+
+T = TypeVar("T")
+
+# Failures worth another attempt: timeouts, dropped connections, 429s and 5xx responses
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError,
+    openai.InternalServerError, TimeoutError
+)
+
+
+def is_retryable(error: BaseException) -> bool:
+    return isinstance(error, RETRYABLE_ERRORS)
+
+
+def retry_after(error: BaseException) -> float:
+    """Seconds the server asked us to wait (retry-after header), or 0."""
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("retry-after", 0)) if response is not None else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class LatencyTracker:
+    """The last `window` latencies, for percentiles."""
+    def __init__(self, window: int = 500):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def report(self) -> dict:
+        ms = lambda q: round(self.percentile(q) * 1000, 1) if len(self) else None
+        return {"samples": len(self), "p50_ms": ms(0.5), "p95_ms": ms(0.95), "p99_ms": ms(0.99), "max_ms": ms(1.0)}
+
+
+class CompletionPolicy:
+    """
+    Deadline, retries and hedging around one prompter's completion calls.
+
+    Every call gets `deadline` seconds in total. Retryable failures (see RETRYABLE_ERRORS) are
+    retried up to `max_retries` times after a full-jitter exponential backoff, or after the
+    server's retry-after if that is longer, as long as the deadline allows. With `hedge`,
+    an async attempt still running after this prompter's HEDGE_PERCENTILE attempt latency
+    gets a duplicate request, and whichever finishes first is used.
+
+    `latency` tracks whole calls (including retries and hedges); `attempt_latency` tracks
+    single requests and sets the hedging delay. An optional `prepare` step run before every
+    request (waiting for the rate limiter) counts against the deadline, but not against
+    `attempt_latency` or the hedging delay; a hedge runs it too before it is sent.
+    """
+    def __init__(
+            self, deadline: float = COMPLETION_DEADLINE, max_retries: int = COMPLETION_MAX_RETRIES,
+            hedge: bool = False, backoff_base: float = COMPLETION_BACKOFF_BASE,
+            backoff_cap: float = COMPLETION_BACKOFF_CAP, rng: random.Random = None):
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.hedge = hedge
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.rng = rng or random.Random()
+        self.latency = LatencyTracker()
+        self.attempt_latency = LatencyTracker()
+        self.stats = {"calls": 0, "retries": 0, "timeouts": 0, "failures": 0, "hedges": 0, "hedge_wins": 0}
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """Seconds to wait before retry number `attempt` (0-based)."""
+        jittered = self.rng.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        return max(jittered, retry_after(error))
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which an attempt is hedged, or None if hedging is off or not calibrated."""
+        if not self.hedge or len(self.attempt_latency) < HEDGE_MIN_SAMPLES:
+            return None
+        return self.attempt_latency.percentile(HEDGE_PERCENTILE)
+
+    def _next_delay(self, attempt: int, error: BaseException, deadline_at: float) -> Optional[float]:
+        """Backoff before the next attempt, or None if the error is final."""
+        if isinstance(error, (TimeoutError, openai.APITimeoutError)):
+            self.stats["timeouts"] += 1
+        if not is_retryable(error) or attempt >= self.max_retries:
+            return None
+        delay = self.backoff(attempt, error)
+        if time.monotonic() + delay >= deadline_at:
+            return None
+        self.stats["retries"] += 1
+        return delay
+
+    def call(self, attempt_fn: Callable[[float], T], prepare: Callable[[float], None] = None) -> T:
+        """
+        Runs `attempt_fn(timeout)` under the policy, each attempt after `prepare(timeout)` if
+        given. Hedging only applies to `acall`.
+        """
+        self.stats["calls"] += 1
+        started = time.monotonic()
+        deadline_at = started + self.deadline
+        for attempt in range(self.max_retries + 1):
+            try:
+                if prepare is not None:
+                    prepare(max(0.0, deadline_at - time.monotonic()))
+                attempt_started = time.monotonic()
+                result = attempt_fn(max(0.0, deadline_at - attempt_started))
+            except Exception as error:
+                delay = self._next_delay(attempt, error, deadline_at)
+                if delay is None:
+                    self.stats["failures"] += 1
+                    raise
+                time.sleep(delay)
+                continue
+            self.attempt_latency.record(time.monotonic() - attempt_started)
+            self.latency.record(time.monotonic() - started)
+            return result
+
+    async def acall(
+            self, attempt_fn: Callable[[], Awaitable[T]],
+            prepare: Callable[[], Awaitable[None]] = None) -> T:
+        """
+        Awaits `attempt_fn()` under the policy, each request after `prepare()` if given.
+        Cancelling the caller cancels every attempt.
+        """
+        self.stats["calls"] += 1
+        started = time.monotonic()
+        deadline_at = started + self.deadline
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = await self._ahedged_attempt(attempt_fn, deadline_at, prepare)
+            except Exception as error:
+                delay = self._next_delay(attempt, error, deadline_at)
+                if delay is None:
+                    self.stats["failures"] += 1
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self.latency.record(time.monotonic() - started)
+            return result
+
+    async def _ahedged_attempt(
+            self, attempt_fn: Callable[[], Awaitable[T]], deadline_at: float,
+            prepare: Callable[[], Awaitable[None]] = None) -> T:
+        async def timed():
+            attempt_started = time.monotonic()
+            result = await attempt_fn()
+            self.attempt_latency.record(time.monotonic() - attempt_started)
+            return result
+
+        async def hedged():
+            if prepare is not None:
+                await prepare()  # Dropped along with the hedge if the primary finishes first
+            return await timed()
+
+        if prepare is not None:
+            try:
+                await asyncio.wait_for(prepare(), max(0.0, deadline_at - time.monotonic()))
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Completion deadline of {self.deadline}s exceeded before sending")
+
+        primary = asyncio.ensure_future(timed())
+        pending = {primary}
+        try:
+            hedge_after = self.hedge_delay()
+            if hedge_after is not None and time.monotonic() + hedge_after < deadline_at:
+                done, _ = await asyncio.wait(pending, timeout=hedge_after)
+                if not done:
+                    self.stats["hedges"] += 1
+                    pending.add(asyncio.ensure_future(hedged()))
+
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(0.0, deadline_at - time.monotonic()),
+                    return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    raise TimeoutError(f"Completion deadline of {self.deadline}s exceeded")
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def report(self) -> dict:
+        return {**self.stats, "latency": self.latency.report()}
@@ -0,0 +1,139 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from utils.constants import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_PATH, RESPONSE_CACHE_TTL
+
+
+def cache_key(model: str, temperature: float, messages: List[dict], response_format: dict) -> str:
+    """Hash of everything that determines a completion request."""
+    payload = json.dumps(
+        [model, temperature, messages, response_format],
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Exact-match cache of raw completion responses.
+
+    Entries live in a bounded in-memory LRU and in a SQLite file, so they survive restarts
+    and are shared by every process on the host. Entries older than `ttl` seconds are
+    treated as missing. Prompters opt in one by one (OpenAIPrompter(cache=True)).
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key        TEXT PRIMARY KEY,
+            created_at REAL NOT NULL,
+            body       TEXT NOT NULL
+        );
+    """
+
+    def __init__(
+            self, db_path: Optional[str] = RESPONSE_CACHE_PATH,
+            max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl: float = RESPONSE_CACHE_TTL):
+        """
+        :param db_path: SQLite file backing the cache, or None to keep it in memory only.
+        :param max_entries: Entries kept in the in-memory LRU.
+        :param ttl: Seconds an entry stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (created_at, body)
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "bytes_saved": 0}
+        self._conn = None
+        if db_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+            self.purge_expired()
+
+    def _fresh(self, created_at: float) -> bool:
+        return time.time() - created_at < self.ttl
+
+    def _remember(self, key: str, created_at: float, body: str) -> None:
+        self._lru[key] = (created_at, body)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def get(self, key: str, request_bytes: int = 0) -> Optional[str]:
+        """
+        Returns the cached response body for a key, or None.
+
+        Args:
+            key (str): From cache_key.
+            request_bytes (int): Size of the request, counted in bytes_saved on a hit.
+        """
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is None and self._conn is not None:
+                entry = self._conn.execute(
+                    "SELECT created_at, body FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if entry is not None:
+                    self._remember(key, *entry)
+            if entry is None or not self._fresh(entry[0]):
+                if entry is not None:
+                    self._evict(key)
+                self.stats["misses"] += 1
+                return None
+            self._lru.move_to_end(key)
+            self.stats["hits"] += 1
+            self.stats["bytes_saved"] += request_bytes + len(entry[1])
+            return entry[1]
+
+    def put(self, key: str, body: str) -> None:
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, created_at, body)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, created_at, body) VALUES (?, ?, ?)",
+                    (key, created_at, body)
+                )
+
+    def _evict(self, key: str) -> None:
+        self._lru.pop(key, None)
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """Deletes expired entries from disk and memory. Returns how many were on disk."""
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for key in [k for k, (created_at, _) in self._lru.items() if created_at <= cutoff]:
+                del self._lru[key]
+            if self._conn is None:
+                return 0
+            return self._conn.execute(
+                "DELETE FROM responses WHERE created_at <= ?", (cutoff,)).rowcount
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+    def report(self) -> dict:
+        return {**self.stats, "hit_rate": round(self.hit_rate, 3), "entries": len(self._lru)}
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+def get_response_cache() -> ResponseCache:
+    """Returns the process-wide response cache, opening it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
@@ -0,0 +1,147 @@
+import random
+import re
+import threading
+from enum import Enum
+from typing import Dict, Iterable, List, Tuple
+
+# Words that usually mean someone is being called out as the AI
+ACCUSATION_WORDS = (
+    "ai", "bot", "robot", "fake", "imposter", "impostor", "sus", "suspicious", "liar",
+    "lying", "doppleganger", "dopplebot", "vote", "voting", "accuse", "human"
+)
+# Lines where the Game Master (or a player) opens the floor to everyone
+ICEBREAKER_MARKERS = ("icebreaker", "game master", "gamemaster", "introduce yourselves")
+# Messages this short with nothing else going on are filler ("lol", "same", "ok")
+FILLER_MAX_WORDS = 4
+
+
+class Verdict(Enum):
+    SKIP = "skip"         # Clearly not for this AI, no completion needed
+    ASK_LLM = "ask_llm"   # Ambiguous, let decide_to_respond decide
+
+
+class ResponseTriage:
+    """
+    Cheap local filter in front of the decide_to_respond prompter.
+
+    Looks only at the messages that arrived since the last call and sorts them with a few
+    precompiled regexes (mentions of the AI's code name or stolen first name, mentions of
+    other code names, question marks, accusation words, icebreaker markers). Only
+    confidently negative cases are answered locally, as SKIP; everything else, including
+    direct questions to the AI, goes to the LLM, which also decides whether to introduce.
+
+    Each ambiguous case is tagged with the rule that sent it to the LLM, and the LLM's
+    answer is fed back through `record_llm`. Once a rule has `min_samples` answers and the
+    LLM replied to fewer than `skip_below` of them, that rule is answered locally as SKIP too,
+    except for an `explore_rate` fraction of cases that still go to the LLM so the rule can
+    be unlearned. Counts are halved once a rule reaches `max_samples`, so old answers fade.
+    """
+    def __init__(
+            self, code_name: str, first_name: str, other_code_names: Iterable[str],
+            min_samples: int = 20, skip_below: float = 0.05, explore_rate: float = 0.1,
+            max_samples: int = 100, rng: random.Random = None):
+        self.code_name = code_name
+        self.min_samples = min_samples
+        self.skip_below = skip_below
+        self.explore_rate = explore_rate
+        self.max_samples = max_samples
+        self.rng = rng or random.Random()
+        self._own_prefix = f"{code_name}:"
+        self._self_re = self._names_re([code_name, first_name])
+        self._others_re = self._names_re(
+            [n for n in other_code_names if n and n != code_name and n != first_name])
+        self._accuse_re = re.compile(
+            r"\b(?:" + "|".join(map(re.escape, ACCUSATION_WORDS)) + r")s?\b", re.IGNORECASE)
+        self._icebreaker_re = re.compile(
+            "|".join(map(re.escape, ICEBREAKER_MARKERS)), re.IGNORECASE)
+        self.stats = {"skip": 0, "ask_llm": 0, "explored": 0}
+        self.llm_outcomes: Dict[str, List[float]] = {}  # rule -> [LLM said respond, total], decayed
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _names_re(names: List[str]) -> re.Pattern:
+        names = sorted({n for n in names if n}, key=len, reverse=True)
+        if not names:
+            return re.compile(r"(?!)")  # Never matches
+        return re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, names)) + r")(?!\w)", re.IGNORECASE)
+
+    def classify_message(self, message: str) -> Tuple[Verdict, str]:
+        """Returns the verdict for one chat line and the name of the rule that decided it."""
+        sender, sep, text = message.partition(":")
+        if not sep:
+            sender, text = "", message
+        if sender == "GM" or self._icebreaker_re.search(message):
+            return Verdict.ASK_LLM, "icebreaker"
+        if self._self_re.search(text):
+            if "?" in text or self._accuse_re.search(text):
+                return Verdict.ASK_LLM, "mention_question"
+            return Verdict.ASK_LLM, "mention"
+        if self._others_re.search(text):
+            return Verdict.SKIP, "other_player"
+        if self._accuse_re.search(text):
+            return Verdict.ASK_LLM, "accusation"
+        if "?" in text:
+            return Verdict.ASK_LLM, "question"
+        if len(text.split()) <= FILLER_MAX_WORDS:
+            return Verdict.SKIP, "filler"
+        return Verdict.ASK_LLM, "statement"
+
+    def classify(self, new_messages: List[str]) -> Tuple[Verdict, List[str]]:
+        """
+        Returns the combined verdict for the messages since the last decision, and the rules
+        that sent it to the LLM (empty unless the verdict is ASK_LLM). The batch is only
+        skipped if every message is.
+        """
+        verdict, ask_rules, explored = Verdict.SKIP, [], False
+        for message in new_messages:
+            if message.startswith(self._own_prefix):
+                continue
+            message_verdict, rule = self.classify_message(message)
+            if message_verdict is Verdict.ASK_LLM and self._learned_skip(rule):
+                if self.rng.random() >= self.explore_rate:
+                    continue
+                explored = True
+            if message_verdict is Verdict.ASK_LLM:
+                verdict = Verdict.ASK_LLM
+                ask_rules.append(rule)
+
+        with self._lock:
+            self.stats[verdict.value] += 1
+            self.stats["explored"] += int(explored)
+        return verdict, ask_rules
+
+    def _learned_skip(self, rule: str) -> bool:
+        responded, total = self.llm_outcomes.get(rule, (0, 0))
+        return total >= self.min_samples and responded / total < self.skip_below
+
+    def record_llm(self, rules: List[str], responded: bool) -> None:
+        """Records what decide_to_respond said about a batch this triage could not decide."""
+        with self._lock:
+            for rule in set(rules):
+                outcome = self.llm_outcomes.setdefault(rule, [0, 0])
+                outcome[0] += int(responded)
+                outcome[1] += 1
+                if outcome[1] >= self.max_samples:
+                    outcome[0], outcome[1] = outcome[0] / 2, outcome[1] / 2
+
+    @property
+    def hits(self) -> int:
+        """Decisions made locally, without a completion."""
+        return self.stats["skip"]
+
+    @property
+    def misses(self) -> int:
+        """Decisions handed to the LLM."""
+        return self.stats["ask_llm"]
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def report(self) -> dict:
+        return {
+            **self.stats,
+            "hit_rate": round(self.hit_rate, 3),
+            "llm_outcomes": {rule: (round(o[0], 1), round(o[1], 1)) for rule, o in self.llm_outcomes.items()},
+        }
@@ -14,6 +14,46 @@ NAMES_INDEX_PATH="./data/runtime/code_names_index.txt"
 COLORS_PATH="./data/runtime/possible_colors.txt"
 COLORS_INDEX_PATH="./data/runtime/colors_index.txt"
 
+LOBBY_STORE="file"  # "file" (chat_log.txt + players.json) or "sqlite"
+LOBBY_DB_PATH="./data/runtime/lobbies.db"
+
+AI_QUIET_PERIOD=0.75  # Seconds of chat silence before an AI reacts to a burst of messages
+AI_MAX_WAIT=3.0       # Longest an AI holds back while a burst keeps going
+
+MINUTES_KEEP_LAST=30        # Latest chat lines sent to the AI verbatim (0 sends everything)
+MINUTES_TOKEN_BUDGET=1500   # Cap on the estimated tokens of those lines (0 for no cap)
+MINUTES_FOLD_BATCH=10       # Older lines gathered before folding them into the game summary
+
+RESPONSE_CACHE_PATH="./data/runtime/response_cache.db"
+RESPONSE_CACHE_MAX_ENTRIES=1024     # Responses kept in memory; the disk copy is unbounded
+RESPONSE_CACHE_TTL=7 * 24 * 3600    # Seconds a cached response stays valid
+
+LLM_BACKEND="openai"    # "openai", "record" (openai + cassette), "replay" (cassette only) or "stub"
+LLM_CASSETTE_PATH="./data/runtime/llm_cassette.jsonl"
+LLM_REPLAY_LATENCY_SCALE=1.0    # Multiplier on recorded latencies in replay mode (0 = instant)
+LLM_STUB_LATENCY=0.0            # Seconds each stub completion takes
+
+COMPLETION_DEADLINE=20.0        # Seconds a completion may take, retries included
+COMPLETION_DEADLINES={          # Per-prompter overrides of COMPLETION_DEADLINE
+    "decide_to_respond": 10.0, "stylizer": 10.0,
+    "game_summary_update": 45.0, "summarize_minutes": 45.0
+}
+COMPLETION_MAX_RETRIES=2        # Retries after a timeout, connection error, 429 or 5xx
+COMPLETION_BACKOFF_BASE=0.5     # Seconds; the backoff cap doubles every retry, jittered
+COMPLETION_BACKOFF_CAP=8.0
+HEDGE_MIN_SAMPLES=20            # Attempts timed before a prompter starts hedging
+HEDGE_PERCENTILE=0.95           # Hedge attempts still running after this latency percentile
+
+RATE_LIMIT_RPM=500              # Requests per minute shared by every prompter in the process
+RATE_LIMIT_TPM=200_000          # Tokens per minute, prompt plus completion
+RATE_LIMIT_COMPLETION_ESTIMATE=150  # Completion tokens assumed before a prompter has any usage
+RATE_LIMIT_PRIORITIES={         # Lower is served first; prompters not listed (replies) get 0
+    "decide_to_respond": 1, "fused": 1,
+    "game_summary_update": 2, "summarize_minutes": 2
+}
+RATE_LIMIT_AGING=5.0            # Seconds queued per step a waiting request's priority improves
+RATE_LIMIT_SHARE_HALF_LIFE=60.0 # Half-life in seconds of the tokens counted against a lobby or AI
+
 BLANK_PS = PlayerState(
     lobby_id="",
     first_name="",
@@ -1,11 +1,18 @@
 from dataclasses import asdict
 import json
 import os
-from typing import List, Tuple
+import threading
+from typing import Dict, List, Optional, Tuple
 from time import sleep
 
 from utils.states import PlayerState
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 def init_chat_log(path: str):
     os.makedirs(os.path.dirname(path), exist_ok=True)
     if not os.path.exists(path):
@@ -13,8 +20,143 @@ def init_chat_log(path: str):
             f.write("")  # Start fresh
 
 def append_message(path: str, message: str) -> None:
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(message + "\n")
+    get_chat_writer(path).append(message)
+
+class ChatWriter:
+    """
+    Appends messages to a chat log atomically, with group commit.
+
+    Each batch is written with a single os.write on an O_APPEND descriptor while holding
+    an exclusive advisory lock on the file, so writers in other processes can never
+    interleave with or tear a message. Messages from several threads are coalesced into
+    one write + fsync: the first caller becomes the leader and commits everything that
+    is pending, and anything appended while that write is in flight goes out together in
+    the next batch. Followers block until their batch is durable. A non-zero
+    `group_window` makes the leader wait that long first so near-simultaneous messages
+    share the fsync, at the cost of that much latency per batch.
+    """
+    def __init__(self, path: str, group_window: float = 0.0, fsync: bool = True):
+        self.path = path
+        self.group_window = group_window
+        self.fsync = fsync
+        self.batches_written = 0
+        self.messages_written = 0
+        self._cond = threading.Condition()
+        self._pending: List[str] = []
+        self._next_batch = 0        # Id of the batch currently collecting messages
+        self._committed = -1        # Id of the last batch that finished writing
+        self._leader_active = False
+        self._errors: Dict[int, list] = {}  # Failed batch -> [error, callers yet to see it]
+
+    def append(self, message: str) -> None:
+        """Appends one message (a trailing newline is added) and returns once it is written."""
+        with self._cond:
+            self._pending.append(message)
+            batch = self._next_batch
+            while self._committed < batch and self._leader_active:
+                self._cond.wait()
+            # No leader is left to write this batch (none yet, or it was interrupted)
+            lead = self._committed < batch
+            if lead:
+                self._leader_active = True
+        if lead:
+            try:
+                self._lead()
+            except BaseException:
+                with self._cond:
+                    self._take_error(batch)  # This caller will not look at it
+                raise
+        with self._cond:
+            error = self._take_error(batch)
+        if error is not None:
+            raise error
+
+    def _take_error(self, batch: int) -> Optional[Exception]:
+        """Returns the error a batch failed with, dropping it once every caller has seen it."""
+        entry = self._errors.get(batch)
+        if entry is None:
+            return None
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self._errors[batch]
+        return entry[0]
+
+    def _lead(self) -> None:
+        """Commits batches until no messages are pending."""
+        try:
+            if self.group_window > 0:
+                sleep(self.group_window)
+            while True:
+                with self._cond:
+                    if not self._pending:
+                        return
+                    messages, self._pending = self._pending, []
+                    batch = self._next_batch
+                    self._next_batch += 1
+                try:
+                    self._write(messages)
+                except BaseException as e:
+                    error = e if isinstance(e, Exception) else OSError(f"Chat write interrupted: {e!r}")
+                    with self._cond:
+                        self._errors[batch] = [error, len(messages)]
+                        self._committed = batch
+                        self._cond.notify_all()
+                    if error is not e:
+                        raise
+                    continue
+                with self._cond:
+                    self._committed = batch
+                    self._cond.notify_all()
+        finally:
+            # Even when interrupted, so a waiting writer can take over as leader
+            with self._cond:
+                self._leader_active = False
+                self._cond.notify_all()
+
+    def _write(self, messages: List[str]) -> None:
+        data = "".join(f"{m}\n" for m in messages).encode("utf-8")
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            self._lock(fd)
+            try:
+                view = memoryview(data)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+                if self.fsync:
+                    os.fsync(fd)
+            finally:
+                self._unlock(fd)
+        finally:
+            os.close(fd)
+        self.batches_written += 1
+        self.messages_written += len(messages)
+
+    @staticmethod
+    def _lock(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    @staticmethod
+    def _unlock(fd: int) -> None:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+_chat_writers: Dict[str, ChatWriter] = {}
+_chat_writers_lock = threading.Lock()
+
+def get_chat_writer(path: str) -> ChatWriter:
+    """Returns the process-wide writer for a chat log, so all threads share its group commit."""
+    with _chat_writers_lock:
+        if path not in _chat_writers:
+            _chat_writers[path] = ChatWriter(path)
+        return _chat_writers[path]
 
 def read_new_messages(path: str, last_line: int) -> Tuple[List[str], int]:
     with open(path, "r", encoding="utf-8") as f:
@@ -22,6 +164,50 @@ def read_new_messages(path: str, last_line: int) -> Tuple[List[str], int]:
     new_lines = lines[last_line:]
     return [line.strip() for line in new_lines], len(lines)
 
+class ChatTailReader:
+    """
+    Incrementally reads a chat log by remembering the byte offset of the last poll.
+
+    Each call to `read_new` only reads the bytes appended since the previous call, so
+    polling cost no longer grows with the size of the log. A trailing line that has not
+    been terminated with a newline yet (a writer is mid-append) is buffered until the
+    rest of it arrives.
+    """
+    def __init__(self, path: str, offset: int = 0):
+        self.path = path
+        self.offset = offset        # Byte offset of the next unread byte
+        self.line_count = 0         # Number of complete lines returned so far
+        self._partial = b""         # Bytes of an unterminated trailing line
+
+    def reset(self) -> None:
+        """Starts reading again from the beginning of the file."""
+        self.offset = 0
+        self.line_count = 0
+        self._partial = b""
+
+    def read_new(self) -> List[str]:
+        """
+        Returns the complete lines appended since the last call, stripped of whitespace.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                if size < self.offset:
+                    # The log was truncated or recreated, start over
+                    self.reset()
+                if size == self.offset:
+                    return []
+                f.seek(self.offset)
+                chunk = f.read(size - self.offset)
+        except FileNotFoundError:
+            return []
+
+        self.offset += len(chunk)
+        *complete, self._partial = (self._partial + chunk).split(b"\n")
+        lines = [line.decode("utf-8", errors="replace").strip() for line in complete]
+        self.line_count += len(lines)
+        return lines
+
 class SequentialAssigner:
     def __init__(self, list_path: str, index_path: str):
         self.list_path = list_path
@@ -86,11 +272,47 @@ def save_player_to_lobby_file(ps: PlayerState) -> None:
     with open(file_path, "w") as f:
         json.dump(players, f, indent=2)
 
-def load_players_from_lobby(lobby_id: str) -> list[PlayerState]:
-    file_path = f"./data/runtime/lobbies/lobby_{lobby_id}/players.json"
-    if not os.path.exists(file_path):
-        return []
+class RosterCache:
+    """
+    Caches a lobby's players.json, keyed on the file's (mtime, size).
 
-    with open(file_path, "r") as f:
-        data = json.load(f)
-        return [PlayerState(**p) for p in data]
+    `load` only re-opens and re-parses the file when it actually changed, and keeps a
+    prebuilt code_name -> PlayerState dict for O(1) lookups. The returned list and dict
+    are shared, so callers should not mutate them.
+    """
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.players: List[PlayerState] = []
+        self.by_code_name: Dict[str, PlayerState] = {}
+        self._stamp: Optional[Tuple[int, int]] = None
+
+    def load(self) -> List[PlayerState]:
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            self.players, self.by_code_name, self._stamp = [], {}, None
+            return self.players
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._stamp:
+            with open(self.file_path, "r") as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    return self.players  # Caught mid-rewrite, keep the last good roster
+            self.players = [PlayerState(**p) for p in data]
+            self.by_code_name = {p.code_name: p for p in self.players}
+            self._stamp = stamp
+        return self.players
+
+_roster_caches: Dict[str, RosterCache] = {}
+
+def get_roster_cache(lobby_id: str) -> RosterCache:
+    """Returns the process-wide roster cache for a lobby."""
+    if lobby_id not in _roster_caches:
+        _roster_caches[lobby_id] = RosterCache(
+            f"./data/runtime/lobbies/lobby_{lobby_id}/players.json")
+    return _roster_caches[lobby_id]
+
+def load_players_from_lobby(lobby_id: str) -> list[PlayerState]:
+    return get_roster_cache(lobby_id).load()
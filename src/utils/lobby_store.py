@@ -0,0 +1,283 @@
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.request import pathname2url
+
+from utils.chat_normalize import is_gm_banner
+from utils.constants import LOBBY_DB_PATH, LOBBY_STORE
+from utils.file_io import (
+    ChatTailReader, append_message, get_roster_cache, init_chat_log, load_players_from_lobby,
+    save_player_to_lobby_file
+)
+from utils.states import PlayerState
+
+def lobby_dir(lobby_id: str) -> str:
+    return f"./data/runtime/lobbies/lobby_{lobby_id}"
+
+def parse_sender(message: str) -> str:
+    """Returns the code name that wrote a chat message, or GAME MASTER for format_gm_message banners."""
+    if is_gm_banner(message):
+        return "GAME MASTER"
+    return message.split(":", 1)[0]
+
+# === Base Store Class ===
+class LobbyStore(ABC):
+    """
+    Where a lobby's chat and roster live. Game code talks to this interface so the
+    storage backend can be swapped without touching the loops.
+    """
+
+    @abstractmethod
+    def init_lobby(self, lobby_id: str) -> bool:
+        """Prepares storage for a lobby. Returns True if its chat was just created."""
+        pass
+
+    @abstractmethod
+    def append_message(self, lobby_id: str, message: str, round_number: int = 0) -> None:
+        """Appends one chat message (which may span several lines)."""
+        pass
+
+    @abstractmethod
+    def chat_reader(self, lobby_id: str):
+        """
+        Returns an incremental reader exposing `read_new() -> List[str]` and `line_count`,
+        suitable for LobbyChatCache.
+        """
+        pass
+
+    @abstractmethod
+    def change_path(self, lobby_id: str) -> str:
+        """Returns the file that changes whenever a message is appended, for watch_file."""
+        pass
+
+    @abstractmethod
+    def save_player(self, ps: PlayerState) -> None:
+        """Adds a player to their lobby's roster unless the code name is already taken."""
+        pass
+
+    @abstractmethod
+    def load_players(self, lobby_id: str) -> List[PlayerState]:
+        """Returns every player in a lobby."""
+        pass
+
+    def load_players_by_code_name(self, lobby_id: str) -> Dict[str, PlayerState]:
+        """Returns every player in a lobby keyed by code name."""
+        return {p.code_name: p for p in self.load_players(lobby_id)}
+
+# === Flat File Implementation ===
+class FileLobbyStore(LobbyStore):
+    """The original layout: chat_log.txt and players.json in the lobby folder."""
+
+    def chat_log_path(self, lobby_id: str) -> str:
+        return os.path.join(lobby_dir(lobby_id), "chat_log.txt")
+
+    def init_lobby(self, lobby_id: str) -> bool:
+        path = self.chat_log_path(lobby_id)
+        if os.path.exists(path):
+            return False
+        init_chat_log(path)
+        return True
+
+    def append_message(self, lobby_id: str, message: str, round_number: int = 0) -> None:
+        append_message(self.chat_log_path(lobby_id), message)
+
+    def chat_reader(self, lobby_id: str) -> ChatTailReader:
+        return ChatTailReader(self.chat_log_path(lobby_id))
+
+    def change_path(self, lobby_id: str) -> str:
+        return self.chat_log_path(lobby_id)
+
+    def save_player(self, ps: PlayerState) -> None:
+        save_player_to_lobby_file(ps)
+
+    def load_players(self, lobby_id: str) -> List[PlayerState]:
+        return load_players_from_lobby(lobby_id)
+
+    def load_players_by_code_name(self, lobby_id: str) -> Dict[str, PlayerState]:
+        roster = get_roster_cache(lobby_id)
+        roster.load()
+        return roster.by_code_name
+
+# === SQLite Implementation ===
+class SQLiteChatReader:
+    """Incremental chat reader for SQLiteLobbyStore, tracking the last sequence number seen."""
+
+    def __init__(self, store: "SQLiteLobbyStore", lobby_id: str):
+        self.store = store
+        self.lobby_id = lobby_id
+        self.last_seq = 0
+        self.line_count = 0
+
+    def read_new(self) -> List[str]:
+        rows = self.store.messages_since(self.lobby_id, self.last_seq)
+        lines = []
+        for seq, text in rows:
+            lines.extend(line.strip() for line in text.split("\n"))
+            self.last_seq = seq
+        self.line_count += len(lines)
+        return lines
+
+
+class SQLiteLobbyStore(LobbyStore):
+    """
+    Stores every lobby in one SQLite database in WAL mode.
+
+    Messages are keyed by (lobby_id, seq), so "messages since seq N" is an index range
+    scan, and players by (lobby_id, code_name). WAL lets readers keep reading while a writer
+    appends; reads go through a read-only connection per thread and never wait for the
+    writer's connection or lock, in this process or any other.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS messages (
+            lobby_id     TEXT    NOT NULL,
+            seq          INTEGER NOT NULL,
+            sender       TEXT    NOT NULL,
+            round_number INTEGER NOT NULL DEFAULT 0,
+            created_at   REAL    NOT NULL,
+            text         TEXT    NOT NULL,
+            PRIMARY KEY (lobby_id, seq)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS messages_by_sender ON messages (lobby_id, sender);
+        CREATE INDEX IF NOT EXISTS messages_by_round ON messages (lobby_id, round_number);
+        CREATE INDEX IF NOT EXISTS messages_by_time ON messages (lobby_id, created_at);
+        CREATE TABLE IF NOT EXISTS lobbies (
+            lobby_id   TEXT PRIMARY KEY,
+            created_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS players (
+            lobby_id   TEXT NOT NULL,
+            code_name  TEXT NOT NULL,
+            data       TEXT NOT NULL,
+            PRIMARY KEY (lobby_id, code_name)
+        );
+    """
+
+    def __init__(self, db_path: str = LOBBY_DB_PATH, busy_timeout_ms: int = 5000):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, timeout=busy_timeout_ms / 1000, isolation_level=None,
+            check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._conn.executescript(self.SCHEMA)
+        self._busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._readers: List[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    def _reader(self) -> sqlite3.Connection:
+        """Returns this thread's read-only connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+            conn = sqlite3.connect(
+                uri, uri=True, timeout=self._busy_timeout_ms / 1000, isolation_level=None,
+                check_same_thread=False  # Only so close() can close it from another thread
+            )
+            self._local.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
+
+    def close(self) -> None:
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers = []
+        self._conn.close()
+
+    def init_lobby(self, lobby_id: str) -> bool:
+        with self._lock:
+            # Claiming the lobbies row under the write lock lets exactly one caller create it
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                created = self._conn.execute(
+                    "INSERT OR IGNORE INTO lobbies (lobby_id, created_at) VALUES (?, ?)",
+                    (lobby_id, time.time())
+                ).rowcount == 1
+                if created and self._conn.execute(
+                        "SELECT 1 FROM messages WHERE lobby_id = ? LIMIT 1", (lobby_id,)
+                ).fetchone() is not None:
+                    created = False  # Chat written before the lobbies table existed
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return created
+
+    def append_message(self, lobby_id: str, message: str, round_number: int = 0) -> int:
+        """Appends a message and returns its sequence number."""
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front so two writers never pick the same seq
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (seq,) = self._conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) + 1 FROM messages WHERE lobby_id = ?",
+                    (lobby_id,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT INTO messages (lobby_id, seq, sender, round_number, created_at, text) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (lobby_id, seq, parse_sender(message), round_number, time.time(), message)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return seq
+
+    def messages_since(self, lobby_id: str, seq: int, limit: Optional[int] = None) -> List[tuple]:
+        """Returns (seq, text) rows with a sequence number greater than `seq`."""
+        query = "SELECT seq, text FROM messages WHERE lobby_id = ? AND seq > ? ORDER BY seq"
+        params = [lobby_id, seq]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return self._reader().execute(query, params).fetchall()
+
+    def chat_reader(self, lobby_id: str) -> SQLiteChatReader:
+        return SQLiteChatReader(self, lobby_id)
+
+    def change_path(self, lobby_id: str) -> str:
+        # Every commit in WAL mode appends to the -wal file
+        return self.db_path + "-wal"
+
+    def save_player(self, ps: PlayerState) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO players (lobby_id, code_name, data) VALUES (?, ?, ?)",
+                (ps.lobby_id, ps.code_name, json.dumps(asdict(ps)))
+            )
+
+    def load_players(self, lobby_id: str) -> List[PlayerState]:
+        rows = self._reader().execute(
+            "SELECT data FROM players WHERE lobby_id = ? ORDER BY rowid", (lobby_id,)
+        ).fetchall()
+        return [PlayerState(**json.loads(data)) for (data,) in rows]
+
+
+_stores: Dict[str, LobbyStore] = {}
+_store_lock = threading.Lock()
+
+def get_lobby_store(backend: str = LOBBY_STORE) -> LobbyStore:
+    """
+    Returns the process-wide lobby store for a backend ("file" or "sqlite"), one per backend.
+    """
+    with _store_lock:
+        if backend not in _stores:
+            if backend == "file":
+                _stores[backend] = FileLobbyStore()
+            elif backend == "sqlite":
+                _stores[backend] = SQLiteLobbyStore()
+            else:
+                raise ValueError(f"Unknown lobby store backend: {backend}. Use 'file' or 'sqlite'.")
+        return _stores[backend]
@@ -0,0 +1,231 @@
+import asyncio
+import ctypes
+import ctypes.util
+import functools
+import os
+import struct
+import sys
+from typing import AsyncIterator, Dict, FrozenSet, Optional, Tuple
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+@functools.lru_cache(maxsize=None)
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """Returns libc if it exposes inotify, otherwise None. Looked up once per process."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class LobbyWatcher:
+    """
+    Watches a lobby directory and yields the names of files that changed.
+
+    Uses inotify on Linux so an idle watcher costs no CPU and changes are delivered
+    within milliseconds. Everywhere else (or if inotify cannot be set up) it falls back
+    to polling the directory every `poll_interval` seconds. The first item is an empty set,
+    yielded as soon as the watch is armed; anything written after it is reported.
+
+    Usage:
+        async for changed in LobbyWatcher(lobby_dir):
+            if "chat_log.txt" in changed:
+                ...
+    """
+    def __init__(self, lobby_dir: str, poll_interval: float = 0.25, use_inotify: bool = True):
+        self.lobby_dir = lobby_dir
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend = None  # "inotify" or "polling", set once iteration starts
+
+    def __aiter__(self) -> AsyncIterator[FrozenSet[str]]:
+        return self._events()
+
+    async def _events(self) -> AsyncIterator[FrozenSet[str]]:
+        # The inotify fd is opened inside the generator, so closing it always closes the fd
+        libc = _load_libc() if self.use_inotify else None
+        fd, events = None, None
+        try:
+            fd = self._open_inotify(libc) if libc is not None else None
+            if fd is not None:
+                self.backend = "inotify"
+                events = self._inotify_events(fd)
+            else:
+                self.backend = "polling"
+                events = self._poll_events(self._snapshot())
+            yield frozenset()
+            async for changed in events:
+                yield changed
+        finally:
+            if events is not None:
+                await events.aclose()
+            if fd is not None:
+                os.close(fd)
+
+    def _open_inotify(self, libc: ctypes.CDLL) -> Optional[int]:
+        """Creates an inotify instance watching the lobby directory."""
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        wd = libc.inotify_add_watch(fd, os.fsencode(self.lobby_dir), _WATCH_MASK)
+        if wd < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    async def _inotify_events(self, fd: int) -> AsyncIterator[FrozenSet[str]]:
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        loop.add_reader(fd, ready.set)
+        try:
+            while True:
+                await ready.wait()
+                ready.clear()
+                changed = self._drain(fd)
+                if changed:
+                    yield changed
+        finally:
+            loop.remove_reader(fd)
+
+    def _drain(self, fd: int) -> FrozenSet[str]:
+        """
+        Reads every pending inotify event and returns the affected file names. A queue
+        overflow or an event without a name (on the directory itself) means changes may have
+        been lost, so every file in the lobby directory is reported as changed.
+        """
+        names = set()
+        everything = False
+        while True:
+            try:
+                buf = os.read(fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buf):
+                _, mask, _, name_len = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + name_len].rstrip(b"\0")
+                offset += name_len
+                if name and not mask & IN_Q_OVERFLOW:
+                    names.add(os.fsdecode(name))
+                else:
+                    everything = True
+        if everything:
+            names.update(self._snapshot())
+        return frozenset(names)
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        """Returns {file_name: (mtime_ns, size)} for every file in the lobby directory."""
+        snapshot = {}
+        try:
+            with os.scandir(self.lobby_dir) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[entry.name] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            pass
+        return snapshot
+
+    async def _poll_events(
+            self, previous: Dict[str, Tuple[int, int]]) -> AsyncIterator[FrozenSet[str]]:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            current = self._snapshot()
+            changed = frozenset(
+                name for name in previous.keys() | current.keys()
+                if previous.get(name) != current.get(name)
+            )
+            previous = current
+            if changed:
+                yield changed
+
+
+async def watch_file(path: str, poll_interval: float = 0.25) -> AsyncIterator[None]:
+    """
+    Yields once immediately and then every time `path` changes.
+
+    The watch is armed before the first yield, so content written before or while the
+    caller handles that first wake-up is never missed.
+
+    Args:
+        path (str): File to watch, e.g. a lobby's chat_log.txt.
+        poll_interval (float): Polling interval used when inotify is unavailable.
+    """
+    lobby_dir, file_name = os.path.split(os.path.abspath(path))
+    events = LobbyWatcher(lobby_dir, poll_interval=poll_interval).__aiter__()
+    try:
+        async for changed in events:
+            if not changed or file_name in changed:  # The empty set: the watch is armed
+                yield
+    finally:
+        await events.aclose()
+
+
+async def debounce(
+        events: AsyncIterator, quiet_period: float, max_wait: float) -> AsyncIterator[None]:
+    """
+    Collapses bursts of events into one yield.
+
+    After an event, waits until `quiet_period` seconds pass with no further event, but never
+    longer than `max_wait` seconds after the first event of the burst. Events that arrive
+    while the caller is busy with the previous yield start the next burst, so none are lost.
+
+    Args:
+        events: Any async iterator, e.g. watch_file(path).
+        quiet_period (float): Silence that ends a burst. 0 disables debouncing.
+        max_wait (float): Longest a burst can hold back a yield.
+    """
+    if quiet_period <= 0:
+        async for _ in events:
+            yield
+        return
+
+    loop = asyncio.get_running_loop()
+    pending = asyncio.Event()
+
+    async def pump() -> None:
+        async for _ in events:
+            pending.set()
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        while True:
+            waiter = asyncio.ensure_future(pending.wait())
+            await asyncio.wait({waiter, pump_task}, return_when=asyncio.FIRST_COMPLETED)
+            if not waiter.done():
+                waiter.cancel()
+                pump_task.result()  # Re-raise whatever stopped the source
+                return
+            pending.clear()
+
+            deadline = loop.time() + max_wait
+            while True:
+                timeout = min(quiet_period, deadline - loop.time())
+                if timeout <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(pending.wait(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.clear()
+            yield
+    finally:
+        pump_task.cancel()
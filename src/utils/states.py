@@ -1,9 +1,9 @@
 from __future__ import annotations
-from dataclasses import asdict, dataclass
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 import json
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class ScreenState(Enum):
     INTRO = 0
@@ -47,4 +47,5 @@ class GameState:
     last_vote_outcome: str          # The outcome of the last vote
     textual_summary: str            # A human-readable summary of the game's progression
     chat_this_round: List[str]      # Chat messages from this round
-    all_chat: List[str]             # All chat messages from the game
\ No newline at end of file
+    all_chat: List[str]             # All chat messages from the game
+    players_by_code_name: Dict[str, PlayerState] = field(default_factory=dict)  # O(1) roster lookups
\ No newline at end of file